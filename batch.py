@@ -0,0 +1,157 @@
+# batch.py
+# NumPy kernels that mirror the scalar geometry in core.py for many rays at once
+# (hint generation, difficulty calibration, bot play). Requires numpy; core.py does not.
+# Angles are in degrees with the same convention as Game.angle (-90° = straight down).
+
+from typing import NamedTuple
+
+import numpy as np
+
+from core import SURFACE_Y_WORLD, WORLD_BOUNDS, ANGLE_MIN, ANGLE_MAX, GOLDEN64, ROUND_PARAMS
+
+class RayHits(NamedTuple):
+    hit: np.ndarray       # bool mask
+    t_entry: np.ndarray   # distance along the ray to the first crossing ahead of the origin (inf on a miss)
+    point: np.ndarray     # (..., 2) hit point in world coords (nan on a miss)
+
+def ray_directions(angles):
+    """Unit direction vectors (..., 2) for angles in degrees."""
+    theta = np.radians(np.asarray(angles, dtype=np.float64))
+    return np.stack((np.cos(theta), np.sin(theta)), axis=-1)
+
+def world_exit_distances(origins, dirs, bounds=WORLD_BOUNDS):
+    """Vectorized slab test (see core.drill_exit_distance): distance from each origin
+       to where its ray leaves the world box."""
+    origins = np.asarray(origins, dtype=np.float64)
+    x_min, x_max, y_min, y_max = bounds
+    lo = np.array((x_min, y_min))
+    hi = np.array((x_max, y_max))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (lo - origins) / dirs
+        t2 = (hi - origins) / dirs
+    far = np.where(dirs != 0.0, np.maximum(t1, t2), np.inf)
+    return np.maximum(far.min(axis=-1), 0.0)
+
+def ray_circle_hits(origins, angles, centers, radii, max_dist=None, outer=True):
+    """Batched ray-vs-circle test.
+
+    origins (N, 2) and angles (N,) describe the rays; centers (M, 2) and radii (M,)
+    the circles. With outer=True every ray is tested against every circle and the
+    results are (N, M); with outer=False the ray and circle arrays are broadcast
+    against each other element-wise. A hit must lie within max_dist of the origin;
+    by default that is where the ray leaves the world box, matching core.resolve_drill.
+    """
+    origins = np.asarray(origins, dtype=np.float64)
+    centers = np.asarray(centers, dtype=np.float64)
+    radii = np.asarray(radii, dtype=np.float64)
+    dirs = ray_directions(angles)
+    origins, dirs = np.broadcast_arrays(origins, dirs)
+    if max_dist is None:
+        max_dist = world_exit_distances(origins, dirs)
+    max_dist = np.asarray(max_dist, dtype=np.float64)
+    if outer:
+        origins = origins[..., None, :]
+        dirs = dirs[..., None, :]
+        max_dist = max_dist[..., None]
+
+    f = origins - centers
+    b = (f * dirs).sum(axis=-1)
+    cterm = (f * f).sum(axis=-1) - radii * radii
+    disc = b * b - cterm
+    disc_sqrt = np.sqrt(np.maximum(disc, 0.0))
+    t_in = -b - disc_sqrt
+    t_out = -b + disc_sqrt
+    # Drill starts at the origin: use the first crossing ahead of it
+    t_hit = np.where(t_in >= 0.0, t_in, t_out)
+    hit = (disc >= 0.0) & (t_hit >= 0.0) & (t_hit <= max_dist)
+    t_entry = np.where(hit, t_hit, np.inf)
+    point = np.where(hit[..., None], origins + dirs * np.where(hit, t_hit, np.nan)[..., None], np.nan)
+    return RayHits(hit, t_entry, point)
+
+class HitWindows(NamedTuple):
+    valid: np.ndarray     # bool mask: some angle in ANGLE_MIN..ANGLE_MAX wins
+    lo: np.ndarray        # interval bounds in degrees (nan where not valid)
+    hi: np.ndarray
+    n_int: np.ndarray     # number of winning integer-degree angles
+
+    @property
+    def optimal(self):
+        return 0.5 * (self.lo + self.hi)
+
+def hit_windows(origin_x, target_x, target_y, radius, bounds=WORLD_BOUNDS):
+    """Vectorized core.hit_window for whole round packs; all inputs broadcast together.
+       Collars are on the surface, as in Game."""
+    ox, cx, cy, r = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64)
+                                          for a in (origin_x, target_x, target_y, radius)))
+    oy = SURFACE_Y_WORLD
+    x_min, x_max, y_min, y_max = bounds
+    eps = 1e-9
+    dx, dy = cx - ox, cy - oy
+    d2 = dx*dx + dy*dy
+    r2 = r * r
+    inside_circle = d2 <= r2
+
+    # Candidate extreme points of circle ∩ box: 2 tangent points + 2 crossings per edge
+    px, py = [], []
+    phi = np.arctan2(dy, dx)
+    with np.errstate(invalid="ignore"):
+        alpha = np.arcsin(np.sqrt(np.where(inside_circle, 0.0, r2 / d2)))
+        tlen = np.sqrt(np.maximum(d2 - r2, 0.0))
+        for a in (phi - alpha, phi + alpha):
+            px.append(ox + tlen * np.cos(a))
+            py.append(oy + tlen * np.sin(a))
+        for x in (x_min, x_max):
+            h = np.sqrt(r2 - (x - cx) ** 2)   # nan where the edge misses the circle
+            for sign in (-1.0, 1.0):
+                px.append(np.full_like(cx, x))
+                py.append(cy + sign * h)
+        for y in (y_min, y_max):
+            h = np.sqrt(r2 - (y - cy) ** 2)
+            for sign in (-1.0, 1.0):
+                px.append(cx + sign * h)
+                py.append(np.full_like(cy, y))
+    px = np.stack(px, axis=-1)
+    py = np.stack(py, axis=-1)
+    ok = ((px >= x_min - eps) & (px <= x_max + eps) & (py >= y_min - eps) & (py <= y_max + eps))
+    ang = np.degrees(np.arctan2(py - oy, px - ox[..., None]))
+    ang = np.where(ang > 90.0, ang - 360.0, ang)
+    lo = np.where(ok, ang, np.inf).min(axis=-1)
+    hi = np.where(ok, ang, -np.inf).max(axis=-1)
+    lo = np.where(inside_circle, ANGLE_MIN, np.maximum(lo, ANGLE_MIN))
+    hi = np.where(inside_circle, ANGLE_MAX, np.minimum(hi, ANGLE_MAX))
+    valid = lo <= hi
+    lo = np.where(valid, lo, np.nan)
+    hi = np.where(valid, hi, np.nan)
+    with np.errstate(invalid="ignore"):
+        n_int = np.where(valid, np.floor(hi) - np.ceil(lo) + 1, 0).astype(np.int64)
+    return HitWindows(valid, lo, hi, n_int)
+
+class RoundPack(NamedTuple):
+    """Columnar rounds; row i equals core.round_from_id(round_id[i])."""
+    round_id: np.ndarray   # uint64
+    origin_x: np.ndarray
+    target_x: np.ndarray
+    target_y: np.ndarray
+    target_radius: np.ndarray
+
+def splitmix64(x):
+    """Vectorized core.splitmix64 on uint64 arrays (wrapping arithmetic)."""
+    z = x + np.uint64(GOLDEN64)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+def generate_rounds(n=None, round_ids=None, seed=None, params=ROUND_PARAMS):
+    """Generate rounds in one vectorized call, either for the given round IDs or for
+       n fresh IDs drawn from `seed`. `params` overrides the (name, low, high) ranges,
+       e.g. for config sweeps; the same IDs then give the same underlying draws."""
+    if round_ids is None:
+        round_ids = np.random.default_rng(seed).integers(0, 2**64, size=n, dtype=np.uint64)
+    ids = np.asarray(round_ids, dtype=np.uint64)
+    cols = []
+    with np.errstate(over="ignore"):
+        for k, (_, lo, hi) in enumerate(params):
+            h = splitmix64(ids + np.uint64(((k + 1) * GOLDEN64) & ((1 << 64) - 1)))
+            u = (h >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+            cols.append(lo + (hi - lo) * u)
+    return RoundPack(ids, *cols)
@@ -0,0 +1,183 @@
+# blockmodel.py
+# 2D block models: a grid of grades (g/t) in square cells under the section view. A drill
+# hole is walked cell by cell with an Amanatides–Woo DDA (core.grid_walk), so each attempt
+# returns its per-cell intercepts, metal content and value in O(cells crossed). Scoring is
+# value intercepted minus DRILL_COST_PER_METER × hole length instead of a binary hit.
+# Set one on a round with Game.set_block_model. Large models live on disk in a tiled
+# float32 format (write_block_model / open_block_model) opened with numpy.memmap, so only
+# the tiles a trace or the viewport touches are ever paged in. Requires numpy.
+
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+from core import DRILL_COST_PER_METER, grid_walk
+
+VALUE_PER_GRADE_METRE = 400.0  # $ per (g/t × m) intercepted; 0.75 g/t pays for the drilling
+
+# On-disk format: a fixed 64-byte little-endian header, then the grid as tile_size ×
+# tile_size float32 tiles in tile-row-major order (edge tiles zero-padded). Tiling keeps a
+# steep hole or a viewport on a few contiguous pages instead of one page per grid row.
+BM_MAGIC = b"GTABLKMD"
+BM_VERSION = 1
+BM_HEADER = struct.Struct("<8sIIIIddd")  # magic, version, nx, ny, tile, x_min, y_max, cell
+BM_HEADER_SIZE = 64
+BM_TILE = 64
+
+@dataclass(frozen=True)
+class CellIntercept:
+    col: int        # block column (x)
+    row: int        # block row, 0 = top of the model
+    s_in: float     # along-hole depth where the hole enters the block (m)
+    s_out: float    # ... and leaves it
+    grade: float    # g/t
+
+    @property
+    def length(self):
+        return self.s_out - self.s_in
+
+@dataclass(frozen=True)
+class GradeTrace:
+    """Blocks crossed by one drill hole, up to where it stops."""
+    cells: tuple    # CellIntercept per block crossed, in hole order
+    drilled: float  # hole length (m)
+    metal: float    # grade × length summed over the blocks (g/t·m)
+    value: float    # $
+
+    @property
+    def cost(self):
+        return self.drilled * DRILL_COST_PER_METER
+
+    @property
+    def score(self):
+        return self.value - self.cost
+
+    def first_ore(self):
+        """First block with grade > 0, or None."""
+        for c in self.cells:
+            if c.grade > 0.0:
+                return c
+        return None
+
+class BlockModel:
+    """grade[row, col] over square cells of `cell` m; (x_min, y_max) is the top-left
+       corner in world coords and row 0 is the top row, as on screen. `grade` is a 2D
+       numpy array or a TiledGrid over a memory-mapped file; it is never copied."""
+    def __init__(self, grade, x_min, y_max, cell, value_per_grade_m=VALUE_PER_GRADE_METRE):
+        self.grade = grade if hasattr(grade, "shape") else np.asarray(grade, dtype=np.float32)
+        if len(self.grade.shape) != 2:
+            raise ValueError("BlockModel grade must be a 2D array")
+        self.ny, self.nx = self.grade.shape
+        self.cell = float(cell)
+        self.x_min = float(x_min)
+        self.y_max = float(y_max)
+        self.x_max = self.x_min + self.nx * self.cell
+        self.y_min = self.y_max - self.ny * self.cell
+        self.value_per_grade_m = value_per_grade_m
+
+    def bounds(self):
+        return self.x_min, self.x_max, self.y_min, self.y_max
+
+    def grade_at(self, x, y):
+        """Grade of the block holding world point (x, y); 0 outside the model."""
+        col = int((x - self.x_min) // self.cell)
+        row = int((self.y_max - y) // self.cell)
+        if 0 <= col < self.nx and 0 <= row < self.ny:
+            return float(self.grade[row, col])
+        return 0.0
+
+    def window(self, row0, row1, col0, col1, step=1):
+        """Grades of rows row0:row1 and cols col0:col1 (every `step`-th block) as an
+           ndarray; reads only that part of a memory-mapped model."""
+        return np.asarray(self.grade[row0:row1:step, col0:col1:step])
+
+    def cells_along(self, p0, d, t_max, s0=0.0):
+        """CellIntercepts for the ray p0 + t*d over [0, t_max]; depths are offset by s0."""
+        out = []
+        for i, j, t_in, t_out in grid_walk(p0, d, t_max, self.x_min, self.y_min, self.cell, self.nx, self.ny):
+            if t_out > t_in:
+                row = self.ny - 1 - j
+                out.append(CellIntercept(i, row, s0 + t_in, s0 + t_out, float(self.grade[row, i])))
+        return out
+
+    def drill(self, points, lengths=None):
+        """Walk a hole given as a polyline of world points (a straight hole is just
+           [collar, end]); `lengths` are along-hole depths at each point (default: the
+           chord lengths). The hole stops at the bottom of the last block with grade > 0,
+           or runs the whole polyline if it crosses no ore."""
+        cells = []
+        s = 0.0
+        for k in range(len(points) - 1):
+            (x0, y0), (x1, y1) = points[k], points[k + 1]
+            seg = float(np.hypot(x1 - x0, y1 - y0))
+            s0 = s if lengths is None else lengths[k]
+            s = s0 + seg if lengths is None else lengths[k + 1]
+            if seg <= 0.0:
+                continue
+            hits = self.cells_along((x0, y0), ((x1 - x0) / seg, (y1 - y0) / seg), seg, s0)
+            if lengths is not None and s - s0 != seg:
+                # Map chord distance to along-hole depth
+                f = (s - s0) / seg
+                hits = [CellIntercept(c.col, c.row, s0 + (c.s_in - s0) * f, s0 + (c.s_out - s0) * f, c.grade)
+                        for c in hits]
+            cells.extend(hits)
+        ore = [k for k, c in enumerate(cells) if c.grade > 0.0]
+        if ore:
+            cells = cells[:ore[-1] + 1]
+            drilled = cells[-1].s_out
+        else:
+            drilled = s
+        metal = sum(c.grade * c.length for c in cells)
+        return GradeTrace(tuple(cells), drilled, metal, metal * self.value_per_grade_m)
+
+# ----------------- Memory-mapped models -----------------
+class TiledGrid:
+    """Read-only 2D view of a tiled grid stored as a (tiles_y, tiles_x, tile, tile) memmap.
+       grid[row, col] reads one float straight from the mapped buffer; grid[r0:r1:s, c0:c1:s]
+       gathers just the requested blocks."""
+    def __init__(self, tiles, ny, nx):
+        self.tiles = tiles
+        self.tile = tiles.shape[2]
+        self.shape = (ny, nx)
+        self.dtype = tiles.dtype
+
+    def __getitem__(self, key):
+        row, col = key
+        t = self.tile
+        if isinstance(row, slice) or isinstance(col, slice):
+            rows = np.arange(self.shape[0])[row] if isinstance(row, slice) else np.array([row])
+            cols = np.arange(self.shape[1])[col] if isinstance(col, slice) else np.array([col])
+            r, c = rows[:, None], cols[None, :]
+            return self.tiles[r // t, c // t, r % t, c % t]
+        return self.tiles[row // t, col // t, row % t, col % t]
+
+def write_block_model(path, grade, x_min, y_max, cell, tile=BM_TILE):
+    """Write a 2D grade array (rows from the top, any array-like incl. a memmap) in the
+       tiled format, one band of `tile` rows at a time so memory stays at tile × nx floats."""
+    ny, nx = grade.shape
+    tiles_x = -(-nx // tile)
+    with open(path, "wb") as f:
+        header = BM_HEADER.pack(BM_MAGIC, BM_VERSION, nx, ny, tile, x_min, y_max, cell)
+        f.write(header.ljust(BM_HEADER_SIZE, b"\0"))
+        for r0 in range(0, ny, tile):
+            band = np.zeros((tile, tiles_x * tile), dtype="<f4")
+            rows = np.asarray(grade[r0:r0 + tile], dtype="<f4")
+            band[:len(rows), :nx] = rows
+            f.write(band.reshape(tile, tiles_x, tile).transpose(1, 0, 2).tobytes())
+
+def open_block_model(path, value_per_grade_m=VALUE_PER_GRADE_METRE):
+    """Open a tiled block-model file as a BlockModel backed by numpy.memmap. Only the
+       header is read up front; grid pages load on first touch."""
+    with open(path, "rb") as f:
+        raw = f.read(BM_HEADER.size)
+    if len(raw) < BM_HEADER.size:
+        raise ValueError(f"{path}: not a block-model file")
+    magic, version, nx, ny, tile, x_min, y_max, cell = BM_HEADER.unpack(raw)
+    if magic != BM_MAGIC:
+        raise ValueError(f"{path}: not a block-model file")
+    if version != BM_VERSION:
+        raise ValueError(f"{path}: unsupported block-model version {version}")
+    shape = (-(-ny // tile), -(-nx // tile), tile, tile)
+    tiles = np.memmap(path, dtype="<f4", mode="r", offset=BM_HEADER_SIZE, shape=shape)
+    return BlockModel(TiledGrid(tiles, ny, nx), x_min, y_max, cell, value_per_grade_m)
@@ -0,0 +1,107 @@
+# bots.py
+# Headless bot-player harness. A strategy is a callable
+#     strategy(info, misses) -> angle
+# where `info` is the round as the player sees it (a core.Round) and `misses` lists the
+# (angle, DrillResult) of earlier failed tries this round. Rounds are played under the
+# normal Game rules (3 tries, DRILL_COST_PER_METER, DRILL_COST_BUDGET) over seeded round
+# IDs, in chunks on a ProcessPoolExecutor. Workers send back only summed BotStats.
+# Strategies must be picklable (module-level functions) to run in worker processes.
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from core import (SURFACE_Y_WORLD, DRILL_COST_BUDGET, MASK64, GOLDEN64, splitmix64,
+                  round_from_id, Game)
+
+@dataclass
+class BotStats:
+    rounds: int = 0
+    wins: int = 0
+    attempts: int = 0
+    total_cost: float = 0.0
+    over_budget: int = 0
+
+    @property
+    def win_rate(self):
+        return self.wins / self.rounds if self.rounds else 0.0
+
+    @property
+    def mean_cost(self):
+        return self.total_cost / self.rounds if self.rounds else 0.0
+
+    @property
+    def overrun_rate(self):
+        return self.over_budget / self.rounds if self.rounds else 0.0
+
+    def merge(self, other):
+        self.rounds += other.rounds
+        self.wins += other.wins
+        self.attempts += other.attempts
+        self.total_cost += other.total_cost
+        self.over_budget += other.over_budget
+        return self
+
+# ----------------- Strategies -----------------
+def _center_angle(info):
+    return math.degrees(math.atan2(info.target_y - SURFACE_Y_WORLD, info.target_x - info.origin_x))
+
+def aim_center(info, misses):
+    """Round the angle to the target centre to the nearest whole degree, as a player would."""
+    return round(_center_angle(info))
+
+def aim_center_floor(info, misses):
+    """Deliberately sloppy reference bot: always truncates toward -180°."""
+    return math.floor(_center_angle(info))
+
+def floor_then_ceil(info, misses):
+    """Truncate first; after a miss, try the whole degree on the other side."""
+    a = _center_angle(info)
+    return math.floor(a) if not misses else math.ceil(a)
+
+# ----------------- Harness -----------------
+def round_id_for(seed, i):
+    """Round ID of the i-th round in a seeded run."""
+    return splitmix64((seed * GOLDEN64 + i) & MASK64)
+
+def play_round(g, strategy, round_id):
+    """Play one round on Game `g` to completion. Returns (won, attempts)."""
+    g.reset_round(round_id)
+    info = round_from_id(round_id)
+    misses = []
+    while True:
+        r = g.drill_instant(strategy(info, misses))
+        if r.hit:
+            return True, len(misses) + 1
+        misses.append((g.angle, r))
+        if not g.retry():
+            return False, len(misses)
+
+def run_chunk(strategy, seed, start, count):
+    """Play rounds [start, start + count) of a seeded run; returns their BotStats."""
+    g = Game()
+    stats = BotStats()
+    for i in range(start, start + count):
+        won, attempts = play_round(g, strategy, round_id_for(seed, i))
+        stats.rounds += 1
+        stats.wins += won
+        stats.attempts += attempts
+        stats.total_cost += g.accumulated_cost
+        stats.over_budget += g.accumulated_cost > DRILL_COST_BUDGET
+    return stats
+
+def run_bots(strategy, n_rounds, seed=0, workers=None, chunk=20000):
+    """Play n_rounds seeded rounds with `strategy` across a process pool.
+       workers=0 runs in-process (handy for debugging and lambdas)."""
+    chunks = [(s, min(chunk, n_rounds - s)) for s in range(0, n_rounds, chunk)]
+    total = BotStats()
+    if workers == 0:
+        for start, count in chunks:
+            total.merge(run_chunk(strategy, seed, start, count))
+        return total
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as ex:
+        futures = [ex.submit(run_chunk, strategy, seed, start, count) for start, count in chunks]
+        for f in futures:
+            total.merge(f.result())
+    return total
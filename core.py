@@ -0,0 +1,581 @@
+# core.py
+# Simulation core for "Guess the Angle": world config, drill geometry, cost model and the
+# Game state machine. Pure Python with no pygame dependency, so batch jobs and simulation
+# workers can import it cheaply; the pygame renderer lives in render.py.
+# World units are metres; y is up (+), so depth is negative.
+
+import math
+import random
+from dataclasses import dataclass, replace
+
+# ----------------- World config -----------------
+SURFACE_Y_WORLD = 0.0   # surface at y = 0 m in world coords
+MAX_DEPTH_WORLD = -900  # stop the drill here if no hit (m)
+
+# Origin point (pivot) on surface in world coords (0, 0). Positioned within the grid area.
+ORIGIN_X_MIN = 100.0   # minimum X position (m) - left boundary of usable grid area
+ORIGIN_X_MAX = 900.0   # maximum X position (m) - right boundary of usable grid area
+# ORIGIN will be set per round in Game class
+
+# Target (orebody) parameters
+TARGET_Y_MIN = -500.0              # minimum depth (m)
+TARGET_Y_MAX = MAX_DEPTH_WORLD    # maximum depth (m) - target will be random between TARGET_Y_MIN and TARGET_Y_MAX
+TARGET_RADIUS_MIN = 5.0            # minimum radius (m)
+TARGET_RADIUS_MAX = 20.0           # maximum radius (m) - target radius will be random between these values
+TARGET_X_MIN, TARGET_X_MAX = 250, 900  # random X range (m) along surface projection
+
+# World box the drill is clipped to (m): a miss stops where the ray leaves it
+WORLD_X_MIN, WORLD_X_MAX = -100.0, 1100.0
+WORLD_BOUNDS = (WORLD_X_MIN, WORLD_X_MAX, MAX_DEPTH_WORLD, SURFACE_Y_WORLD)
+# Longest possible attempt (box diagonal), so cost and duration are bounded up front
+MAX_DRILL_PATH = math.hypot(WORLD_X_MAX - WORLD_X_MIN, SURFACE_Y_WORLD - MAX_DEPTH_WORLD)
+
+# Drilling cost
+DRILL_COST_PER_METER = 300.0  # Cost per meter of drilling ($/m)
+DRILL_COST_BUDGET = 500000.0  # Total budget for drilling ($)
+
+# Angle limits & default
+# -90° = straight down (vertical)
+ANGLE_MIN = -180.0
+ANGLE_MAX = 0.0
+ANGLE_DEFAULT = -90.0
+
+# ----------------- Utilities -----------------
+def clamp(v, a, b): return max(a, min(b, v))
+def deg2rad(d): return d * math.pi / 180.0
+
+def line_circle_intersection(p0, p1, c, r):
+    """Check if segment p0->p1 intersects circle centered at c, radius r.
+       p0, p1, c are (x,y) in WORLD coords."""
+    (x1, y1), (x2, y2) = p0, p1
+    (cx, cy) = c
+    dx, dy = (x2 - x1), (y2 - y1)
+    fx, fy = (x1 - cx), (y1 - cy)
+    a = dx*dx + dy*dy
+    b = 2*(fx*dx + fy*dy)
+    cterm = fx*fx + fy*fy - r*r
+    disc = b*b - 4*a*cterm
+    if disc < 0:
+        return False, None
+    disc_sqrt = math.sqrt(disc)
+    t1 = (-b - disc_sqrt) / (2*a)
+    t2 = (-b + disc_sqrt) / (2*a)
+    # We need an intersection anywhere along the segment [0,1]
+    for t in (t1, t2):
+        if 0.0 <= t <= 1.0:
+            ix = x1 + t*dx
+            iy = y1 + t*dy
+            return True, (ix, iy)
+    return False, None
+
+def ray_circle_interval(p0, d, c, r):
+    """Closed-form ray/circle test for a ray p0 + t*d with unit direction d.
+       Returns (t_in, t_out) distances along the ray, or None if the line misses."""
+    fx, fy = p0[0] - c[0], p0[1] - c[1]
+    b = fx*d[0] + fy*d[1]
+    cterm = fx*fx + fy*fy - r*r
+    disc = b*b - cterm
+    if disc < 0:
+        return None
+    disc_sqrt = math.sqrt(disc)
+    return (-b - disc_sqrt, -b + disc_sqrt)
+
+# ----------------- Drill resolution -----------------
+@dataclass(frozen=True)
+class DrillResult:
+    """Outcome of one drill attempt, computed up front in closed form."""
+    hit: bool
+    entry_point: tuple      # where the ray enters the orebody (None on a miss)
+    exit_point: tuple       # where the ray would leave the orebody (None on a miss)
+    end_point: tuple        # where the drill stops: entry point on a hit, world box exit on a miss
+    path_length: float      # m
+    cost: float             # $
+    direction: tuple        # unit (vx, vy)
+    target_index: int = None  # which orebody was hit, for multi-orebody rounds
+    path: object = None       # drillpath.DrillPath for a curved hole (None = straight)
+    grade: object = None      # blockmodel.GradeTrace when the round has a block model
+    miss_distance: float = None  # closest approach to an orebody on a miss, when a shape measures it
+
+def drill_exit_distance(p0, d, bounds=None):
+    """Slab test: distance along the ray from p0 (inside the box) to where it leaves
+       the world box (x_min, x_max, y_min, y_max). Always finite for a unit d."""
+    x_min, x_max, y_min, y_max = bounds or WORLD_BOUNDS
+    t = math.inf
+    for p, v, lo, hi in ((p0[0], d[0], x_min, x_max), (p0[1], d[1], y_min, y_max)):
+        if v != 0.0:
+            t1, t2 = (lo - p) / v, (hi - p) / v
+            t = min(t, max(t1, t2))
+    return max(t, 0.0)
+
+def grid_walk(p0, d, t_max, x_min, y_min, cell, nx, ny):
+    """Amanatides–Woo traversal of an nx × ny grid of square cells whose lower-left
+       corner is (x_min, y_min). Yields (i, j, t_enter, t_exit) for each cell the ray
+       p0 + t*d crosses over 0 <= t <= t_max, in order along the ray."""
+    # Clip the ray to the grid box (slab test)
+    t0, t1 = 0.0, t_max
+    for p, v, lo, hi in ((p0[0], d[0], x_min, x_min + nx * cell), (p0[1], d[1], y_min, y_min + ny * cell)):
+        if v == 0.0:
+            if p < lo or p > hi:
+                return
+        else:
+            a, b = (lo - p) / v, (hi - p) / v
+            if a > b:
+                a, b = b, a
+            t0, t1 = max(t0, a), min(t1, b)
+    if t0 > t1:
+        return
+    i = min(nx - 1, max(0, int((p0[0] + d[0] * t0 - x_min) // cell)))
+    j = min(ny - 1, max(0, int((p0[1] + d[1] * t0 - y_min) // cell)))
+    step_i = 1 if d[0] > 0 else -1
+    step_j = 1 if d[1] > 0 else -1
+    if d[0] != 0.0:
+        edge = x_min + (i + (d[0] > 0)) * cell
+        t_next_x, dt_x = (edge - p0[0]) / d[0], cell / abs(d[0])
+    else:
+        t_next_x, dt_x = math.inf, math.inf
+    if d[1] != 0.0:
+        edge = y_min + (j + (d[1] > 0)) * cell
+        t_next_y, dt_y = (edge - p0[1]) / d[1], cell / abs(d[1])
+    else:
+        t_next_y, dt_y = math.inf, math.inf
+    t = t0
+    while t <= t1 and 0 <= i < nx and 0 <= j < ny:
+        t_exit = min(t_next_x, t_next_y, t1)
+        yield i, j, t, t_exit
+        if t_next_x < t_next_y:
+            i += step_i
+            t = t_next_x
+            t_next_x += dt_x
+        else:
+            j += step_j
+            t = t_next_y
+            t_next_y += dt_y
+
+def resolve_drill(origin, angle, target, radius, orebodies=None):
+    """O(1) resolution of a drill attempt from `origin` at `angle` (deg) against a circle.
+       With `orebodies` (an orebodies.OrebodyIndex) the drill is tested against every
+       orebody in the index instead, whatever its shape, and stops at the first one it hits."""
+    theta = deg2rad(angle)
+    d = (math.cos(theta), math.sin(theta))
+    t_stop = drill_exit_distance(origin, d)
+    if orebodies is not None:
+        hit = orebodies.first_hit(origin, d, t_stop)
+        if hit is not None:
+            entry = (origin[0] + d[0]*hit.t_in, origin[1] + d[1]*hit.t_in)
+            exit_ = (origin[0] + d[0]*hit.t_out, origin[1] + d[1]*hit.t_out)
+            return DrillResult(True, entry, exit_, entry, hit.t_in, hit.t_in * DRILL_COST_PER_METER, d, hit.index)
+        end = (origin[0] + d[0]*t_stop, origin[1] + d[1]*t_stop)
+        return DrillResult(False, None, None, end, t_stop, t_stop * DRILL_COST_PER_METER, d)
+    span = ray_circle_interval(origin, d, target, radius)
+    if span is not None:
+        t_in, t_out = span
+        # Drill starts at the origin: use the first crossing ahead of it
+        t_hit = t_in if t_in >= 0.0 else t_out
+        if 0.0 <= t_hit <= t_stop:
+            entry = (origin[0] + d[0]*t_hit, origin[1] + d[1]*t_hit)
+            exit_ = (origin[0] + d[0]*t_out, origin[1] + d[1]*t_out)
+            return DrillResult(True, entry, exit_, entry, t_hit, t_hit * DRILL_COST_PER_METER, d)
+    end = (origin[0] + d[0]*t_stop, origin[1] + d[1]*t_stop)
+    return DrillResult(False, None, None, end, t_stop, t_stop * DRILL_COST_PER_METER, d)
+
+# ----------------- Hit window -----------------
+@dataclass(frozen=True)
+class HitWindow:
+    """Closed interval of winning angles (deg) for a round, already clamped to ANGLE_MIN..ANGLE_MAX."""
+    lo: float
+    hi: float
+
+    @property
+    def width(self):
+        return self.hi - self.lo
+
+    @property
+    def optimal(self):
+        """Angle with the most margin on both sides."""
+        return 0.5 * (self.lo + self.hi)
+
+    def integer_angles(self):
+        """Integer-degree handle settings that win."""
+        return range(math.ceil(self.lo), math.floor(self.hi) + 1)
+
+def _point_angle(ox, oy, px, py):
+    a = math.degrees(math.atan2(py - oy, px - ox))
+    # Everything reachable lies at or below the surface; map the +180° branch to -180°
+    return a - 360.0 if a > 90.0 else a
+
+def hit_window(origin, target, radius, bounds=None):
+    """O(1) exact set of angles from `origin` whose drill hits the circle before leaving
+       the world box, as a HitWindow (None if no angle wins).
+
+       Inside the box the reachable part of the orebody (circle ∩ box) is convex, so
+       the winning angles form one interval bounded by its extreme points: the two
+       tangent points where they lie in the box, otherwise where the circle crosses a
+       box edge."""
+    x_min, x_max, y_min, y_max = bounds or WORLD_BOUNDS
+    ox, oy = origin
+    cx, cy = target
+    dx, dy = cx - ox, cy - oy
+    d2 = dx*dx + dy*dy
+    r2 = radius * radius
+    if d2 <= r2:
+        # Collar inside the orebody: every angle wins immediately
+        return HitWindow(ANGLE_MIN, ANGLE_MAX)
+    eps = 1e-9
+    def inside(px, py):
+        return x_min - eps <= px <= x_max + eps and y_min - eps <= py <= y_max + eps
+
+    angles = []
+    # Tangent points
+    phi = math.atan2(dy, dx)
+    alpha = math.asin(math.sqrt(r2 / d2))
+    tlen = math.sqrt(d2 - r2)
+    for a in (phi - alpha, phi + alpha):
+        px, py = ox + tlen * math.cos(a), oy + tlen * math.sin(a)
+        if inside(px, py):
+            angles.append(_point_angle(ox, oy, px, py))
+    # Circle crossings of the box edges
+    for x in (x_min, x_max):
+        h2 = r2 - (x - cx) ** 2
+        if h2 >= 0.0:
+            h = math.sqrt(h2)
+            for py in (cy - h, cy + h):
+                if inside(x, py):
+                    angles.append(_point_angle(ox, oy, x, py))
+    for y in (y_min, y_max):
+        h2 = r2 - (y - cy) ** 2
+        if h2 >= 0.0:
+            h = math.sqrt(h2)
+            for px in (cx - h, cx + h):
+                if inside(px, y):
+                    angles.append(_point_angle(ox, oy, px, y))
+    if not angles:
+        return None
+    lo, hi = max(min(angles), ANGLE_MIN), min(max(angles), ANGLE_MAX)
+    if lo > hi:
+        return None
+    return HitWindow(lo, hi)
+
+# ----------------- Round generation -----------------
+# A round is fully determined by a 64-bit round ID: each parameter is a uniform draw
+# from a splitmix64 hash of (round_id, parameter index). Being counter-based rather
+# than a sequential RNG, the same draws can be computed for millions of IDs at once in
+# NumPy (batch.generate_rounds) and come out bit-identical to round_from_id().
+MASK64 = (1 << 64) - 1
+GOLDEN64 = 0x9E3779B97F4A7C15
+
+def splitmix64(x):
+    z = (x + GOLDEN64) & MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK64
+    return z ^ (z >> 31)
+
+def id_uniform(round_id, k):
+    """k-th uniform draw in [0, 1) for a round ID."""
+    return (splitmix64((round_id + k * GOLDEN64) & MASK64) >> 11) * (1.0 / (1 << 53))
+
+# (attribute, low, high) in draw order
+ROUND_PARAMS = (
+    ("origin_x", ORIGIN_X_MIN, ORIGIN_X_MAX),
+    ("target_x", TARGET_X_MIN, TARGET_X_MAX),
+    ("target_y", TARGET_Y_MIN, TARGET_Y_MAX),
+    ("target_radius", TARGET_RADIUS_MIN, TARGET_RADIUS_MAX),
+)
+
+@dataclass(frozen=True)
+class Round:
+    round_id: int
+    origin_x: float
+    target_x: float
+    target_y: float
+    target_radius: float
+
+def round_from_id(round_id):
+    """Regenerate a round's collar and orebody from its ID alone."""
+    round_id &= MASK64
+    vals = [lo + (hi - lo) * id_uniform(round_id, k + 1) for k, (_, lo, hi) in enumerate(ROUND_PARAMS)]
+    return Round(round_id, *vals)
+
+def format_round_id(round_id):
+    return f"{round_id:016x}"
+
+def parse_round_id(s):
+    return int(s, 16) & MASK64
+
+@dataclass(frozen=True)
+class DifficultyBand:
+    """Acceptance criteria for generated rounds. A bound of None is not checked."""
+    min_int_angles: int = 1        # winning integer-degree handle settings
+    max_int_angles: int = None
+    min_cost: float = None         # cost of the optimal shot ($)
+    max_cost: float = None
+
+    def accepts(self, rnd):
+        """Scalar check of one Round (see roundgen.generate_filtered for batches)."""
+        origin = (rnd.origin_x, SURFACE_Y_WORLD)
+        w = hit_window(origin, (rnd.target_x, rnd.target_y), rnd.target_radius)
+        n = len(w.integer_angles()) if w else 0
+        if n < self.min_int_angles or (self.max_int_angles is not None and n > self.max_int_angles):
+            return False
+        if self.min_cost is None and self.max_cost is None:
+            return True
+        if w is None:
+            return False
+        cost = resolve_drill(origin, w.optimal, (rnd.target_x, rnd.target_y), rnd.target_radius).cost
+        return ((self.min_cost is None or cost >= self.min_cost) and
+                (self.max_cost is None or cost <= self.max_cost))
+
+# ----------------- Game State -----------------
+class Game:
+    def __init__(self, seed=None, pool=None):
+        self.angle = ANGLE_DEFAULT  # deg
+        self.origin_x = 0.0  # Will be set in reset_round()
+        self.rng = random.Random(seed)  # draws round IDs; seed it for a reproducible sequence
+        self.pool = pool  # optional roundpool.RoundPool with pre-validated rounds
+        self.deviation = None  # optional drillpath.DeviationProfile; None drills straight holes
+        self.historical_holes = None  # optional section polylines from desurvey.section_polylines
+        self.reset_round()
+
+    def reset_round(self, round_id=None):
+        """Start a new round. Pass a round ID to replay/share a specific round."""
+        if round_id is not None:
+            self.load_round(round_from_id(round_id))
+        elif self.pool is not None:
+            self.load_round(self.pool.pop())
+        else:
+            self.load_round(round_from_id(self.rng.getrandbits(64)))
+
+    def load_round(self, rnd):
+        """Start the round described by a Round (see round_from_id)."""
+        self.round_id = rnd.round_id
+        self.origin_x = rnd.origin_x  # drill origin position horizontally
+        self.target_x = rnd.target_x
+        self.target_y = rnd.target_y  # depth between TARGET_Y_MIN and TARGET_Y_MAX
+        self.target_radius = rnd.target_radius
+        self.orebodies = None  # optional OrebodyIndex for multi-orebody rounds
+        self.block_model = None  # optional blockmodel.BlockModel; scores by value instead of hit/miss
+        self.state = "aim"  # "aim" -> "drilling" -> "win"/"lose"
+        self.drill_tip = (self.origin_x, SURFACE_Y_WORLD)
+        self.drill_speed_mps = 900.0  # m/s on animation (fast, purely visual)
+        self.result_point = None
+        self.drill_result = None  # DrillResult of the current/last attempt
+        self.tries_remaining = 3  # Give user 3 tries per round
+        self.drill_path_length = 0.0  # Total length of drill path (m)
+        self.total_cost = 0.0  # Total cost of drilling ($)
+        self.accumulated_cost = 0.0  # Accumulated cost across all tries in this round ($)
+    
+    def get_origin(self):
+        """Get the current origin point as a tuple."""
+        return (self.origin_x, SURFACE_Y_WORLD)
+
+    def resolve(self, angle=None):
+        """Outcome of drilling at `angle` (default: current angle) without changing state."""
+        angle = self.angle if angle is None else angle
+        if self.block_model is not None:
+            return self._resolve_blocks(angle)
+        if self.deviation is not None:
+            r = self._resolve_curved(angle)
+        else:
+            r = resolve_drill(self.get_origin(), angle,
+                              (self.target_x, self.target_y), self.target_radius, self.orebodies)
+        if not r.hit and self.orebodies is not None:
+            miss = self._miss_distance(r)
+            if miss is not None:
+                r = replace(r, miss_distance=miss)
+        return r
+
+    def _miss_distance(self, r):
+        """Closest approach of a missed hole to the orebodies, or None unless every
+           shape in the index can measure it (a partial minimum would be misleading)."""
+        if r.path is not None:
+            pts = r.path.points
+            segs = []
+            for (x0, y0), (x1, y1) in zip(pts, pts[1:]):
+                seg = math.hypot(x1 - x0, y1 - y0)
+                if seg > 0.0:
+                    segs.append(((x0, y0), ((x1 - x0) / seg, (y1 - y0) / seg), seg))
+        else:
+            segs = [(self.get_origin(), r.direction, r.path_length)]
+        best = None
+        for shape in self.orebodies.shapes:
+            for p, d, seg in segs:
+                v = shape.closest_approach(p, d, seg)
+                if v is None:
+                    return None
+                best = v if best is None else min(best, v)
+        return best
+
+    def _hit_test(self, p, d, seg_len):
+        """(t_in, t_out, orebody index) of the first hit along a segment, or None."""
+        if self.orebodies is not None:
+            hit = self.orebodies.first_hit(p, d, seg_len)
+            return (hit.t_in, hit.t_out, hit.index) if hit is not None else None
+        span = ray_circle_interval(p, d, (self.target_x, self.target_y), self.target_radius)
+        if span is None:
+            return None
+        t = span[0] if span[0] >= 0.0 else span[1]
+        return (t, span[1], None) if 0.0 <= t <= seg_len else None
+
+    def _resolve_curved(self, angle):
+        path = self.deviation.path(self.get_origin(), angle)
+        hit, s, point, exit_, index = path.resolve(self._hit_test)
+        theta = deg2rad(angle)
+        d = (math.cos(theta), math.sin(theta))
+        if hit:
+            return DrillResult(True, point, exit_, point, s, s * DRILL_COST_PER_METER, d, index, path)
+        return DrillResult(False, None, None, point, s, s * DRILL_COST_PER_METER, d, None, path)
+
+    def _resolve_blocks(self, angle):
+        # Block-model round: the hole runs through the model and wins if it pays for itself
+        theta = deg2rad(angle)
+        d = (math.cos(theta), math.sin(theta))
+        origin = self.get_origin()
+        path = None
+        if self.deviation is not None:
+            path = self.deviation.path(origin, angle)
+            path.extend_to(path.max_length)
+            gt = self.block_model.drill(path.points, path.lengths)
+            end = path.point_at(gt.drilled)
+        else:
+            t_stop = drill_exit_distance(origin, d)
+            gt = self.block_model.drill([origin, (origin[0] + d[0]*t_stop, origin[1] + d[1]*t_stop)])
+            end = (origin[0] + d[0]*gt.drilled, origin[1] + d[1]*gt.drilled)
+        ore = gt.first_ore()
+        entry = None
+        if ore is not None:
+            entry = (path.point_at(ore.s_in) if path is not None
+                     else (origin[0] + d[0]*ore.s_in, origin[1] + d[1]*ore.s_in))
+        return DrillResult(gt.score > 0.0, entry, end if ore is not None else None, end,
+                           gt.drilled, gt.cost, d, None, path, gt)
+
+    def set_block_model(self, model):
+        """Score this round against a blockmodel.BlockModel (value intercepted minus
+           drilling cost) instead of the target circle; None reverts to hit/miss."""
+        self.block_model = model
+
+    def set_orebodies(self, index):
+        """Make this a multi-orebody round (an orebodies.OrebodyIndex, which should
+           include the round's own target, e.g. OrebodyIndex.from_round); None reverts
+           to the single target. Shapes build their cached data here, before any drilling."""
+        if index is not None:
+            for shape in index.shapes:
+                shape.prepare()
+        self.orebodies = index
+
+    def hit_window(self):
+        """Exact interval of winning angles for this round (None if unreachable)."""
+        return hit_window(self.get_origin(), (self.target_x, self.target_y), self.target_radius)
+
+    def start_drill(self):
+        if self.state != "aim":
+            return
+        self.state = "drilling"
+        self.drill_tip = self.get_origin()
+        self.result_point = None
+        self.drill_path_length = 0.0  # Reset path length for new drill attempt
+        # The outcome is fixed at the moment of drilling; update() only plays it back
+        self.drill_result = self.resolve()
+
+    def drill_instant(self, angle=None):
+        """Resolve a whole attempt immediately (no animation). Returns the DrillResult,
+           or None if the game isn't in the aim state."""
+        if self.state != "aim":
+            return None
+        if angle is not None:
+            self.angle = clamp(angle, ANGLE_MIN, ANGLE_MAX)
+        self.start_drill()
+        self._finish_drill()
+        return self.drill_result
+
+    def retry(self):
+        """Go back to aiming after a miss, if tries remain. Returns True if allowed."""
+        if self.state == "lose" and self.tries_remaining > 0:
+            self.state = "aim"
+            return True
+        return False
+
+    def update(self, dt):
+        if self.state != "drilling" or dt <= 0:
+            return
+        # Advance the tip along the precomputed trace; the animation is pure playback
+        r = self.drill_result
+        self.drill_path_length = min(self.drill_path_length + self.drill_speed_mps * dt, r.path_length)
+        if self.drill_path_length >= r.path_length:
+            self._finish_drill()
+            return
+        if r.path is not None:
+            self.drill_tip = r.path.point_at(self.drill_path_length)
+            return
+        ox, oy = self.get_origin()
+        self.drill_tip = (ox + r.direction[0] * self.drill_path_length,
+                          oy + r.direction[1] * self.drill_path_length)
+
+    def _finish_drill(self):
+        r = self.drill_result
+        self.drill_tip = r.end_point
+        self.drill_path_length = r.path_length
+        self.total_cost = r.cost
+        # Add to accumulated cost
+        self.accumulated_cost += self.total_cost
+        if r.hit:
+            self.state = "win"
+            self.result_point = r.entry_point
+        else:
+            self.state = "lose"
+            self.result_point = None
+            self.tries_remaining -= 1
+
+# ----------------- Fixed-timestep driver -----------------
+SIM_HZ = 240.0                  # simulation ticks per second
+MAX_SIM_STEPS_PER_FRAME = 16    # guard against a spiral of death on slow frames
+MAX_FRAME_DT = 0.25             # catch-up limit: longer hitches are dropped (s)
+
+class FixedStepDriver:
+    """Advances a Game in constant dt ticks regardless of render rate, so the
+       drill tip, path length and cost come out the same for any frame pacing.
+       Rendering reads `render_tip()`, interpolated between the last two ticks."""
+    def __init__(self, game, hz=SIM_HZ, max_steps=MAX_SIM_STEPS_PER_FRAME, max_frame_dt=MAX_FRAME_DT):
+        self.game = game
+        self.step_dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.max_frame_dt = max_frame_dt
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.prev_tip = game.drill_tip
+        self.steps = 0          # total ticks run
+        self.dropped_time = 0.0 # sim time discarded by the catch-up guards (s)
+
+    def advance(self, frame_dt):
+        """Run as many whole ticks as frame_dt allows; returns the tick count."""
+        g = self.game
+        if g.state != "drilling":
+            self.accumulator = 0.0
+            self.alpha = 0.0
+            self.prev_tip = g.drill_tip
+            return 0
+        if frame_dt > self.max_frame_dt:
+            self.dropped_time += frame_dt - self.max_frame_dt
+            frame_dt = self.max_frame_dt
+        self.accumulator += frame_dt
+        n = 0
+        while self.accumulator >= self.step_dt and n < self.max_steps and g.state == "drilling":
+            self.prev_tip = g.drill_tip
+            g.update(self.step_dt)
+            self.accumulator -= self.step_dt
+            n += 1
+        if g.state != "drilling":
+            self.accumulator = 0.0
+        elif self.accumulator >= self.step_dt:
+            # Hit the per-frame step cap; keep at most one tick of backlog
+            self.dropped_time += self.accumulator - self.step_dt
+            self.accumulator = self.step_dt
+        self.steps += n
+        self.alpha = self.accumulator / self.step_dt
+        return n
+
+    def render_tip(self):
+        g = self.game
+        if g.state != "drilling":
+            return g.drill_tip
+        (px, py), (cx, cy) = self.prev_tip, g.drill_tip
+        a = self.alpha
+        return (px + (cx - px) * a, py + (cy - py) * a)
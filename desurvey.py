@@ -0,0 +1,112 @@
+# desurvey.py
+# Minimum-curvature desurvey of imported drillholes. Survey stations (hole, depth, dip,
+# azimuth) for any number of holes are turned into XYZ positions in one vectorized pass,
+# then projected onto a vertical section so historical holes can be plotted on the
+# section view (Game.historical_holes) and checked against orebodies.
+# Conventions: dip in degrees, negative below horizontal (-90 = straight down); azimuth
+# in degrees clockwise from north; XYZ = (east, north, elevation). Requires numpy.
+
+from typing import NamedTuple
+
+import numpy as np
+
+class Desurveyed(NamedTuple):
+    hole: np.ndarray    # (N,) hole index per station, grouped and depth-sorted
+    depth: np.ndarray   # (N,) along-hole depth (m)
+    xyz: np.ndarray     # (N, 3) station positions
+    starts: np.ndarray  # (H,) index of each hole's first station
+
+def directions(dip, azimuth):
+    """Unit (east, north, up) vectors for dip/azimuth in degrees."""
+    d = np.radians(np.asarray(dip, dtype=np.float64))
+    a = np.radians(np.asarray(azimuth, dtype=np.float64))
+    c = np.cos(d)
+    return np.stack((c * np.sin(a), c * np.cos(a), np.sin(d)), axis=-1)
+
+def sort_stations(hole, depth):
+    """Order that groups stations by hole and sorts each hole by depth."""
+    return np.lexsort((depth, hole))
+
+def desurvey(hole, depth, dip, azimuth, collars):
+    """Minimum-curvature XYZ for every station of every hole at once.
+
+       hole/depth/dip/azimuth are (N,) station columns, grouped by hole and sorted by
+       depth (see sort_stations); `hole` indexes rows of collars, an (H, 3) array. A
+       hole whose first station is below the collar runs straight from the collar at
+       that station's orientation."""
+    hole = np.asarray(hole)
+    depth = np.asarray(depth, dtype=np.float64)
+    collars = np.asarray(collars, dtype=np.float64)
+    t = directions(dip, azimuth)
+    n = len(depth)
+    first = np.ones(n, dtype=bool)
+    first[1:] = hole[1:] != hole[:-1]
+    starts = np.flatnonzero(first)
+
+    inc = np.empty((n, 3))
+    if n:
+        t1, t2 = t[:-1], t[1:]
+        cos_b = np.clip((t1 * t2).sum(axis=1), -1.0, 1.0)
+        beta = np.arccos(cos_b)                     # dogleg angle
+        small = beta < 1e-9
+        rf = np.where(small, 1.0, 2.0 / np.where(small, 1.0, beta) * np.tan(beta / 2.0))
+        md = np.diff(depth)
+        inc[1:] = (md * rf / 2.0)[:, None] * (t1 + t2)
+        inc[first] = t[first] * depth[first][:, None]
+    # Segmented cumulative sum: per-hole offsets from the collar
+    cs = np.cumsum(inc, axis=0)
+    base = np.zeros((len(starts), 3))
+    base[1:] = cs[starts[1:] - 1]
+    counts = np.diff(np.append(starts, n))
+    xyz = cs - np.repeat(base, counts, axis=0) + collars[hole]
+    return Desurveyed(hole, depth, xyz, starts)
+
+def project_to_section(xyz, origin, azimuth):
+    """Section coordinates of XYZ points for a vertical section through `origin`
+       (east, north, elevation) striking along `azimuth`. Returns (x along the section,
+       y = elevation relative to the origin, which is world y in Game, offset off-section)."""
+    xyz = np.asarray(xyz, dtype=np.float64)
+    a = np.radians(azimuth)
+    de = xyz[..., 0] - origin[0]
+    dn = xyz[..., 1] - origin[1]
+    x = de * np.sin(a) + dn * np.cos(a)
+    off = de * np.cos(a) - dn * np.sin(a)
+    return x, xyz[..., 2] - origin[2], off
+
+def section_polylines(holes, origin, azimuth, width=None):
+    """Per-hole 2D polylines [(x, y), ...] in section (= Game world) coords. With
+       `width`, only stations within width/2 of the section plane are kept."""
+    x, y, off = project_to_section(holes.xyz, origin, azimuth)
+    keep = np.ones(len(x), dtype=bool) if width is None else np.abs(off) <= width / 2.0
+    pts = np.stack((x, y), axis=-1)
+    bounds = np.append(holes.starts, len(x))
+    lines = []
+    for k in range(len(holes.starts)):
+        sl = slice(bounds[k], bounds[k + 1])
+        seg = pts[sl][keep[sl]]
+        if len(seg) >= 2:
+            lines.append([tuple(p) for p in seg.tolist()])
+    return lines
+
+def polyline_intercepts(line, index):
+    """Orebody crossings along one section polyline, as (orebody index, depth in, depth out)
+       measured along the polyline; `index` is an orebodies.OrebodyIndex. A crossing that
+       spans survey stations is reported once, and touches of zero length are dropped."""
+    out = []
+    last = {}  # orebody index -> position in `out` of its latest crossing
+    s0 = 0.0
+    for (x0, y0), (x1, y1) in zip(line, line[1:]):
+        seg = float(np.hypot(x1 - x0, y1 - y0))
+        if seg > 0.0:
+            d = ((x1 - x0) / seg, (y1 - y0) / seg)
+            for h in index.trace((x0, y0), d, seg).hits:
+                s_in, s_out = s0 + h.t_in, s0 + h.t_out
+                k = last.get(h.index)
+                if k is not None and s_in <= out[k][2]:
+                    # Continues the crossing from the previous segment
+                    out[k] = (h.index, out[k][1], max(out[k][2], s_out))
+                else:
+                    last[h.index] = len(out)
+                    out.append((h.index, s_in, s_out))
+        s0 += seg
+    return [c for c in out if c[2] > c[1]]
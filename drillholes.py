@@ -0,0 +1,227 @@
+# drillholes.py
+# Streaming importer for historical drillhole exports: collar, survey and assay CSVs.
+# Files are read as chunked iterators and joined on hole ID through the collar table, so
+# memory is bounded by the (compact, columnar) result plus one chunk, never the whole
+# file. The result desurveys straight into desurvey.py for plotting on the section view.
+# Requires numpy.
+
+import csv
+import os
+import time
+from dataclasses import dataclass
+from itertools import islice, repeat
+
+import numpy as np
+
+import desurvey
+
+CHUNK_ROWS = 65536
+
+# Accepted header names per field (matched case-insensitively)
+COLLAR_COLUMNS = {
+    "hole": ("holeid", "hole_id", "hole", "bhid"),
+    "east": ("east", "easting", "x"),
+    "north": ("north", "northing", "y"),
+    "elev": ("rl", "elev", "elevation", "z"),
+}
+SURVEY_COLUMNS = {
+    "hole": COLLAR_COLUMNS["hole"],
+    "depth": ("depth", "at", "md"),
+    "dip": ("dip", "inclination"),
+    "azimuth": ("azimuth", "azi", "brg", "bearing"),
+}
+ASSAY_COLUMNS = {
+    "hole": COLLAR_COLUMNS["hole"],
+    "from": ("from", "depth_from", "from_m"),
+    "to": ("to", "depth_to", "to_m"),
+}
+
+@dataclass
+class IngestStats:
+    """Throughput of one imported file."""
+    name: str
+    rows: int = 0
+    skipped: int = 0    # rows whose hole ID has no collar
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_s(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_s(self):
+        return self.bytes / 2**20 / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.name}: {self.rows:,} rows ({self.skipped:,} skipped), "
+                f"{self.bytes / 2**20:,.1f} MB in {self.seconds:.2f} s "
+                f"- {self.rows_per_s:,.0f} rows/s, {self.mb_per_s:,.1f} MB/s")
+
+def _resolve_columns(header, fields, path):
+    names = [h.strip().lower() for h in header]
+    out = {}
+    for field, aliases in fields.items():
+        for a in aliases:
+            if a.lower() in names:
+                out[field] = names.index(a.lower())
+                break
+        else:
+            raise ValueError(f"{path}: no column for {field!r} (tried {', '.join(aliases)})")
+    return out
+
+def _floats(values):
+    """Column of CSV strings -> float64, with blanks/unparseable values as NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except ValueError:
+        out = np.empty(len(values))
+        for k, v in enumerate(values):
+            try:
+                out[k] = float(v)
+            except ValueError:
+                out[k] = np.nan
+        return out
+
+def read_chunks(path, fields, chunk_rows=CHUNK_ROWS):
+    """Yield {field: tuple of strings} for successive chunks of up to chunk_rows rows.
+       `fields` maps field names to accepted header names (see SURVEY_COLUMNS)."""
+    with open(path, newline="", encoding="utf-8-sig") as f:  # Excel exports start with a BOM
+        reader = csv.reader(f)
+        cols = _resolve_columns(next(reader), fields, path)
+        need = max(cols.values()) + 1
+        first = 2  # file row number of the chunk's first row (the header is row 1)
+        while True:
+            raw = list(islice(reader, chunk_rows))
+            if not raw:
+                return
+            rows = [r for r in raw if r]  # blank lines come through as []
+            columns = list(zip(*rows))  # transpose in C; stops at the shortest row
+            if rows and len(columns) < need:
+                k, bad = next((k, r) for k, r in enumerate(raw) if r and len(r) < need)
+                raise ValueError(f"{path}: row {first + k} has {len(bad)} fields, "
+                                 f"need {need}: {bad!r}")
+            first += len(raw)
+            if rows:
+                yield {name: columns[i] for name, i in cols.items()}
+
+def _stream_join(path, fields, index, numeric, chunk_rows, stats):
+    """Stream `path`, map hole IDs through `index` and collect numeric columns as
+       float32 chunks. Rows for unknown holes are dropped and counted."""
+    holes, cols = [], {name: [] for name in numeric}
+    for chunk in read_chunks(path, fields, chunk_rows):
+        keys = chunk["hole"]
+        h = np.fromiter(map(index.get, map(str.strip, keys), repeat(-1)), dtype=np.int32, count=len(keys))
+        keep = h >= 0
+        stats.rows += len(h)
+        stats.skipped += int(len(h) - keep.sum())
+        holes.append(h[keep])
+        for name in numeric:
+            cols[name].append(_floats(chunk[name])[keep].astype(np.float32))
+    hole = np.concatenate(holes) if holes else np.empty(0, np.int32)
+    return hole, {name: np.concatenate(c) if c else np.empty(0, np.float32) for name, c in cols.items()}
+
+def _sorted(hole, key, cols):
+    """Sort rows by (hole, key) unless they already are (the usual export order)."""
+    if len(hole) > 1:
+        dh = np.diff(hole)
+        if (dh >= 0).all() and ((dh > 0) | (np.diff(key) >= 0)).all():
+            return hole, cols
+    order = np.lexsort((key, hole))
+    return hole[order], {name: c[order] for name, c in cols.items()}
+
+class Drillholes:
+    """Columnar drillhole data. Holes are rows of `ids`/`collars`; survey stations and
+       assay intervals refer to them by int32 hole index and are sorted by hole, depth."""
+    def __init__(self, ids, collars, survey_hole, depth, dip, azimuth,
+                 assay_hole=None, depth_from=None, depth_to=None, grade=None, stats=()):
+        self.ids = ids                  # hole ID strings
+        self.collars = collars          # (H, 3) east, north, elevation
+        self.survey_hole = survey_hole  # (N,) int32
+        self.depth = depth              # (N,) float32 along-hole depth
+        self.dip = dip
+        self.azimuth = azimuth
+        self.assay_hole = assay_hole    # (M,) int32, or None without assays
+        self.depth_from = depth_from
+        self.depth_to = depth_to
+        self.grade = grade
+        self.stats = list(stats)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def report(self):
+        """Ingest throughput, one line per file."""
+        return "\n".join(str(s) for s in self.stats)
+
+    def desurvey(self):
+        """Minimum-curvature XYZ of every survey station (holes without stations are left out)."""
+        return desurvey.desurvey(self.survey_hole, self.depth, self.dip, self.azimuth, self.collars)
+
+    def assay_xyz(self, holes=None):
+        """XYZ of each assay interval's mid-depth, interpolated between the desurveyed
+           stations of its hole (`holes`: a previous desurvey() result). NaN for assays
+           in holes without survey stations."""
+        if self.depth_from is None:
+            raise ValueError("assay_xyz() needs assays; import_drillholes() was given no assay file")
+        holes = holes if holes is not None else self.desurvey()
+        mid = (self.depth_from.astype(np.float64) + self.depth_to) / 2.0
+        out = np.full((len(mid), 3), np.nan)
+        if not len(holes.depth) or not len(mid):
+            return out
+        # Position of each assay among the stations, by (hole, depth)
+        scale = float(max(holes.depth.max(), mid.max())) + 1.0
+        key = holes.hole.astype(np.float64) * scale + holes.depth
+        k = np.searchsorted(key, self.assay_hole.astype(np.float64) * scale + mid)
+        hi = np.clip(k, 0, len(key) - 1)
+        lo = np.clip(k - 1, 0, len(key) - 1)
+        hi = np.where(holes.hole[hi] == self.assay_hole, hi, lo)
+        lo = np.where(holes.hole[lo] == self.assay_hole, lo, hi)
+        ok = holes.hole[lo] == self.assay_hole
+        span = holes.depth[hi] - holes.depth[lo]
+        u = np.clip(np.where(span > 0, (mid - holes.depth[lo]) / np.where(span > 0, span, 1.0), 0.0), 0.0, 1.0)
+        out[ok] = (holes.xyz[lo] + (holes.xyz[hi] - holes.xyz[lo]) * u[:, None])[ok]
+        return out
+
+def import_drillholes(collar_path, survey_path, assay_path=None, grade_column="au",
+                      chunk_rows=CHUNK_ROWS):
+    """Stream collar, survey and (optional) assay CSVs into a Drillholes. The collar
+       table defines the holes; survey and assay rows are joined to it by hole ID chunk
+       by chunk, so peak memory is the columnar result plus one chunk of rows."""
+    stats = []
+    # Collars: one row per hole, and the hole ID -> index map for the join
+    st = IngestStats(os.path.basename(collar_path), bytes=os.path.getsize(collar_path))
+    t0 = time.perf_counter()
+    ids, index, xyz = [], {}, []
+    for chunk in read_chunks(collar_path, COLLAR_COLUMNS, chunk_rows):
+        for k in chunk["hole"]:
+            k = k.strip()
+            if k in index:
+                raise ValueError(f"{collar_path}: duplicate hole ID {k!r}")
+            index[k] = len(ids)
+            ids.append(k)
+        xyz.append(np.stack([_floats(chunk[c]) for c in ("east", "north", "elev")], axis=1))
+        st.rows += len(chunk["hole"])
+    collars = np.concatenate(xyz) if xyz else np.empty((0, 3))
+    st.seconds = time.perf_counter() - t0
+    stats.append(st)
+
+    st = IngestStats(os.path.basename(survey_path), bytes=os.path.getsize(survey_path))
+    t0 = time.perf_counter()
+    s_hole, s = _stream_join(survey_path, SURVEY_COLUMNS, index, ("depth", "dip", "azimuth"), chunk_rows, st)
+    s_hole, s = _sorted(s_hole, s["depth"], s)
+    st.seconds = time.perf_counter() - t0
+    stats.append(st)
+
+    a_hole, a = None, dict.fromkeys(("from", "to", "grade"))
+    if assay_path is not None:
+        st = IngestStats(os.path.basename(assay_path), bytes=os.path.getsize(assay_path))
+        t0 = time.perf_counter()
+        fields = dict(ASSAY_COLUMNS, grade=(grade_column,))
+        a_hole, a = _stream_join(assay_path, fields, index, ("from", "to", "grade"), chunk_rows, st)
+        a_hole, a = _sorted(a_hole, a["from"], a)
+        st.seconds = time.perf_counter() - t0
+        stats.append(st)
+
+    return Drillholes(ids, collars, s_hole, s["depth"], s["dip"], s["azimuth"],
+                      a_hole, a["from"], a["to"], a["grade"], stats)
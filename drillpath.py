@@ -0,0 +1,155 @@
+# drillpath.py
+# Curved, deviating drill holes. A DeviationProfile says how fast the hole lifts (flattens)
+# or drops (steepens) with along-hole depth; DrillPath turns that into a polyline trace,
+# generated lazily in short constant-curvature steps. Intersection is tested segment by
+# segment as the trace grows, with early exit on the first hit, and everything already
+# generated/tested is cached, so per-frame playback is O(1) amortized.
+# Set Game.deviation to a profile to drill curved holes. Pure Python, no pygame/numpy.
+
+import bisect
+import math
+
+from core import WORLD_BOUNDS, MAX_DRILL_PATH, drill_exit_distance
+
+DEVIATION_STEP = 5.0                    # m of hole per polyline segment
+MAX_CURVED_PATH = 2.0 * MAX_DRILL_PATH  # stop holes that curl around inside the box
+
+class DeviationProfile:
+    """Piecewise-constant lift rate: rows of (from_depth_m, deg_per_100m), sorted by depth.
+       Positive rates lift the hole toward horizontal, negative rates drop it toward
+       vertical; depth is measured along the hole."""
+    def __init__(self, table=((0.0, 0.0),), step=DEVIATION_STEP):
+        self.table = sorted((float(d), float(r)) for d, r in table)
+        self.step = step
+        self._depths = [d for d, _ in self.table]
+
+    @classmethod
+    def constant(cls, deg_per_100m, step=DEVIATION_STEP):
+        return cls(((0.0, deg_per_100m),), step)
+
+    def lift(self, s0, s1):
+        """Degrees of lift accumulated between along-hole depths s0 <= s1."""
+        total = 0.0
+        k = max(0, bisect.bisect_right(self._depths, s0) - 1)
+        s = s0
+        while s < s1:
+            start, rate = self.table[k]
+            if s < start:
+                # Above the first row: no deviation until its depth
+                s = min(s1, start)
+                continue
+            end = self.table[k + 1][0] if k + 1 < len(self.table) else math.inf
+            seg_end = min(s1, end)
+            total += rate * (seg_end - s) / 100.0
+            s = seg_end
+            k += 1
+        return total
+
+    def path(self, origin, angle, bounds=None):
+        return DrillPath(origin, angle, self, bounds)
+
+class DrillPath:
+    """Lazily generated polyline for a hole collared at `origin` with initial `angle` (deg)."""
+    def __init__(self, origin, angle, profile, bounds=None, max_length=MAX_CURVED_PATH):
+        self.profile = profile
+        self.bounds = bounds or WORLD_BOUNDS
+        self.max_length = max_length
+        # Lift flattens the hole away from vertical on whichever side it points
+        self.side = 1.0 if angle >= -90.0 else -1.0
+        self.points = [tuple(origin)]
+        self.lengths = [0.0]            # along-hole depth at each point
+        self.angles = [float(angle)]    # hole angle (deg) at each point
+        self.bbox = [(origin[0], origin[0], origin[1], origin[1])]  # running bbox per point
+        self.done = False               # left the world box or hit max_length
+        self._tested = 0                # segments already checked for a hit
+        self._cursor = 0                # playback segment cache for point_at()
+
+    def _grow(self):
+        s0 = self.lengths[-1]
+        h = min(self.profile.step, self.max_length - s0)
+        a0 = self.angles[-1]
+        a1 = a0 + self.side * self.profile.lift(s0, s0 + h)
+        # Exact chord of a constant-curvature step: mid angle, length h·sinc(Δ/2)
+        half = math.radians(a1 - a0) / 2.0
+        chord = h * (math.sin(half) / half if half else 1.0)
+        mid = math.radians((a0 + a1) / 2.0)
+        d = (math.cos(mid), math.sin(mid))
+        x0, y0 = self.points[-1]
+        t_exit = drill_exit_distance((x0, y0), d, self.bounds)
+        if t_exit < chord:
+            # Leaves the world box inside this step
+            frac = t_exit / chord if chord else 0.0
+            chord, h, a1 = t_exit, h * frac, a0 + (a1 - a0) * frac
+            self.done = True
+        p = (x0 + d[0] * chord, y0 + d[1] * chord)
+        bx = self.bbox[-1]
+        self.points.append(p)
+        self.lengths.append(s0 + h)
+        self.angles.append(a1)
+        self.bbox.append((min(bx[0], p[0]), max(bx[1], p[0]), min(bx[2], p[1]), max(bx[3], p[1])))
+        if self.lengths[-1] >= self.max_length:
+            self.done = True
+
+    def extend_to(self, s):
+        while not self.done and self.lengths[-1] < s:
+            self._grow()
+
+    @property
+    def length(self):
+        return self.lengths[-1]
+
+    def resolve(self, hit_test):
+        """Walk segments from the cached prefix until hit_test(p, unit_d, seg_len)
+           returns (t_in, t_out, index) for a hit on that segment, or the path ends.
+           Returns (hit, along-hole depth, point, exit point, index); the exit point
+           continues the hit segment straight through the orebody."""
+        k = self._tested
+        while True:
+            if k + 1 >= len(self.points):
+                if self.done:
+                    break
+                self._grow()
+                continue
+            (x0, y0), (x1, y1) = self.points[k], self.points[k + 1]
+            seg = math.hypot(x1 - x0, y1 - y0)
+            if seg > 0.0:
+                d = ((x1 - x0) / seg, (y1 - y0) / seg)
+                hit = hit_test((x0, y0), d, seg)
+                if hit is not None:
+                    t, t_out, index = hit
+                    self._tested = k
+                    s = self.lengths[k] + (self.lengths[k + 1] - self.lengths[k]) * (t / seg)
+                    return (True, s, (x0 + d[0] * t, y0 + d[1] * t),
+                            (x0 + d[0] * t_out, y0 + d[1] * t_out), index)
+            k += 1
+            self._tested = k
+        return False, self.lengths[-1], self.points[-1], None, None
+
+    def _segment_at(self, s):
+        # Playback moves forward, so start from the last segment used
+        k = self._cursor
+        if s < self.lengths[k]:
+            k = max(0, bisect.bisect_right(self.lengths, s) - 1)
+        while k + 1 < len(self.lengths) - 1 and self.lengths[k + 1] <= s:
+            k += 1
+        self._cursor = k
+        return k
+
+    def point_at(self, s):
+        """Point at along-hole depth s (clamped to the generated path)."""
+        self.extend_to(s)
+        if s >= self.lengths[-1]:
+            return self.points[-1]
+        k = self._segment_at(s)
+        s0, s1 = self.lengths[k], self.lengths[k + 1]
+        u = (s - s0) / (s1 - s0) if s1 > s0 else 0.0
+        (x0, y0), (x1, y1) = self.points[k], self.points[k + 1]
+        return (x0 + (x1 - x0) * u, y0 + (y1 - y0) * u)
+
+    def trace_upto(self, s):
+        """Polyline from the collar to depth s: (points, bbox)."""
+        tip = self.point_at(s)
+        k = self._segment_at(s) if s < self.lengths[-1] else len(self.points) - 1
+        bx = self.bbox[k]
+        bbox = (min(bx[0], tip[0]), max(bx[1], tip[0]), min(bx[2], tip[1]), max(bx[3], tip[1]))
+        return self.points[:k + 1] + [tip], bbox
@@ -0,0 +1,218 @@
+# masks.py
+# Bitmap orebodies: an ore/no-ore mask (PNG or raw bytes) aligned to the world grid at
+# PX_PER_M pixels per metre. MaskShape implements the shapes.Shape protocol, so it drops
+# into an OrebodyIndex like any other shape: hits are resolved by walking the mask pixels
+# along the ray (core.grid_walk), O(path length). An exact Euclidean distance transform
+# covering the world box is built once per mask and cached; closest_approach() reads it
+# along the drilled path to give the "Δ miss" without any per-frame geometry. It is built
+# when the mask is handed to Game.set_orebodies, not on the first missed hole.
+# Requires numpy; PNG loading also needs pygame.
+
+import math
+
+import numpy as np
+
+from core import WORLD_BOUNDS, SURFACE_Y_WORLD, grid_walk
+from shapes import Shape
+
+_BIG = 1e20  # "no feature" cost for the distance transform
+
+def _edt_rows(f):
+    """Squared 1D Euclidean distance transform of every row of f (squared costs),
+       Felzenszwalb–Huttenlocher lower envelope, vectorized across rows."""
+    n_rows, n = f.shape
+    rows = np.arange(n_rows)
+    v = np.zeros((n_rows, n), dtype=np.intp)     # parabola vertices in the envelope
+    z = np.full((n_rows, n + 1), np.inf)         # envelope breakpoints
+    z[:, 0] = -np.inf
+    k = np.zeros(n_rows, dtype=np.intp)
+    for q in range(1, n):
+        fq = f[:, q] + q * q
+        while True:
+            vk = v[rows, k]
+            s = (fq - (f[rows, vk] + vk * vk)) / (2.0 * (q - vk))
+            pop = s <= z[rows, k]
+            if not pop.any():
+                break
+            k[pop] -= 1
+        k += 1
+        v[rows, k] = q
+        z[rows, k] = s
+        z[rows, k + 1] = np.inf
+    out = np.empty_like(f)
+    k[:] = 0
+    for q in range(n):
+        while True:
+            adv = z[rows, k + 1] < q
+            if not adv.any():
+                break
+            k[adv] += 1
+        vk = v[rows, k]
+        out[:, q] = (q - vk) ** 2 + f[rows, vk]
+    return out
+
+def distance_transform(mask):
+    """Exact Euclidean distance (in pixels) from every pixel to the nearest True pixel."""
+    f = np.where(mask, 0.0, _BIG)
+    f = _edt_rows(f.T).T    # along columns
+    return np.sqrt(_edt_rows(f))
+
+class MaskShape(Shape):
+    """Orebody from a boolean mask[row, col]; row 0 is the top, pixel (0, 0) has its
+       top-left corner at world (x_min, y_max) and pixels are 1 / px_per_m metres."""
+    def __init__(self, mask, x_min=0.0, y_max=SURFACE_Y_WORLD, px_per_m=1.0):
+        self.mask = np.ascontiguousarray(mask, dtype=bool)
+        if self.mask.ndim != 2:
+            raise ValueError("MaskShape needs a 2D mask")
+        self.ny, self.nx = self.mask.shape
+        self.px = 1.0 / px_per_m
+        self.x_min = float(x_min)
+        self.y_max = float(y_max)
+        rows = np.flatnonzero(self.mask.any(axis=1))
+        cols = np.flatnonzero(self.mask.any(axis=0))
+        if not len(rows):
+            raise ValueError("MaskShape mask has no ore pixels")
+        # Tight box around the ore pixels
+        self._bbox = (self.x_min + cols[0] * self.px, self.x_min + (cols[-1] + 1) * self.px,
+                      self.y_max - (rows[-1] + 1) * self.px, self.y_max - rows[0] * self.px)
+        self._field = None
+        self._inner = None
+
+    def bbox(self):
+        return self._bbox
+
+    def _runs(self, p0, d, t_max):
+        """(t_in, t_out) runs of ore pixels along p0 + t*d, 0 <= t <= t_max."""
+        run = None
+        for i, j, t0, t1 in grid_walk(p0, d, t_max, self.x_min, self.y_max - self.ny * self.px,
+                                      self.px, self.nx, self.ny):
+            if self.mask[self.ny - 1 - j, i]:
+                if run is None:
+                    run = t0
+            elif run is not None:
+                yield run, t0
+                run = None
+        if run is not None:
+            yield run, t1
+
+    def intervals(self, p0, d):
+        # Walk the whole line: start far enough back to be outside the mask
+        x0, x1, y0, y1 = self._bbox
+        back = math.hypot(p0[0] - (x0 + x1) / 2, p0[1] - (y0 + y1) / 2) + math.hypot(x1 - x0, y1 - y0)
+        start = (p0[0] - d[0] * back, p0[1] - d[1] * back)
+        return [(a - back, b - back) for a, b in self._runs(start, d, 2.0 * back)]
+
+    def ray_interval(self, p0, d, t_max=math.inf):
+        if not math.isfinite(t_max):
+            x0, x1, y0, y1 = self._bbox
+            t_max = math.hypot(p0[0] - (x0 + x1) / 2, p0[1] - (y0 + y1) / 2) + math.hypot(x1 - x0, y1 - y0)
+        for t_in, t_out in self._runs(p0, d, t_max):
+            return (t_in, t_out)
+        return None
+
+    def _interval_batch(self, o, d):
+        t_in = np.full(len(o), np.inf)
+        t_out = np.full(len(o), -np.inf)
+        for k in range(len(o)):
+            for a, b in self.intervals(o[k], d[k]):
+                if b >= 0.0:
+                    t_in[k], t_out[k] = a, b
+                    break
+        return t_in, t_out
+
+    # ----------------- Distance field -----------------
+    def distance_field(self):
+        """(field, x_min, y_max): distance in metres to the nearest ore pixel, on the
+           mask's pixel grid padded out to cover the world box. Built by prepare() (or on
+           first use) and cached for the life of the mask (i.e. once per round)."""
+        if self._field is None:
+            wx0, wx1, wy0, wy1 = WORLD_BOUNDS
+            left = max(0, math.ceil((self.x_min - wx0) / self.px))
+            top = max(0, math.ceil((wy1 - self.y_max) / self.px))
+            right = max(0, math.ceil((wx1 - (self.x_min + self.nx * self.px)) / self.px))
+            bottom = max(0, math.ceil(((self.y_max - self.ny * self.px) - wy0) / self.px))
+            padded = np.pad(self.mask, ((top, bottom), (left, right)))
+            self._field = (distance_transform(padded) * self.px,
+                           self.x_min - left * self.px, self.y_max + top * self.px)
+        return self._field
+
+    def prepare(self):
+        # The transform takes a noticeable fraction of a second on a world-sized grid;
+        # doing it here keeps it out of start_drill
+        self.distance_field()
+
+    def _field_at(self, field, fx0, fy1, x, y):
+        col = min(field.shape[1] - 1, max(0, int((x - fx0) // self.px)))
+        row = min(field.shape[0] - 1, max(0, int((fy1 - y) // self.px)))
+        return float(field[row, col])
+
+    def signed_distance(self, p):
+        """Distance to the nearest ore pixel outside; inside, minus the distance to the
+           nearest waste pixel (both to pixel centres)."""
+        field, fx0, fy1 = self.distance_field()
+        d = self._field_at(field, fx0, fy1, *p)
+        if d > 0.0:
+            return d
+        col = int((p[0] - self.x_min) // self.px)
+        row = int((self.y_max - p[1]) // self.px)
+        if not (0 <= col < self.nx and 0 <= row < self.ny):
+            return 0.0
+        return -float(self._inner_field()[row, col])
+
+    def _inner_field(self):
+        # Inside is rare (drills stop at entry), so this field is only built on demand;
+        # everything beyond the mask edge counts as waste
+        if self._inner is None:
+            waste = np.pad(~self.mask, 1, constant_values=True)
+            self._inner = distance_transform(waste)[1:-1, 1:-1] * self.px
+        return self._inner
+
+    def signed_distance_batch(self, points):
+        p = np.asarray(points, dtype=np.float64)
+        field, fx0, fy1 = self.distance_field()
+        col = np.clip(((p[..., 0] - fx0) // self.px).astype(np.intp), 0, field.shape[1] - 1)
+        row = np.clip(((fy1 - p[..., 1]) // self.px).astype(np.intp), 0, field.shape[0] - 1)
+        out = field[row, col]
+        inside = out == 0.0
+        if inside.any():
+            # Field cell -> mask cell (the field is the mask padded by whole pixels)
+            r = np.clip(row[inside] - round((fy1 - self.y_max) / self.px), 0, self.ny - 1)
+            c = np.clip(col[inside] - round((self.x_min - fx0) / self.px), 0, self.nx - 1)
+            out[inside] = -self._inner_field()[r, c]
+        return out
+
+    def closest_approach(self, p0, d, t_max):
+        """Smallest distance from the drilled segment p0 + t*d (0 <= t <= t_max) to the
+           ore, read off the cached field along the walk (0 if the segment crosses ore)."""
+        field, fx0, fy1 = self.distance_field()
+        ny, nx = field.shape
+        best = math.inf
+        for i, j, _, _ in grid_walk(p0, d, t_max, fx0, fy1 - ny * self.px, self.px, nx, ny):
+            v = field[ny - 1 - j, i]
+            if v < best:
+                best = float(v)
+                if best == 0.0:
+                    break
+        return best
+
+    def outline(self, n=64):
+        """Box around the ore pixels (the renderer draws the mask itself)."""
+        x0, x1, y0, y1 = self._bbox
+        return [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
+
+def load_png(path, px_per_m=1.0, x_min=0.0, y_max=SURFACE_Y_WORLD, threshold=128):
+    """MaskShape from an image: ore where alpha (if present) or brightness >= threshold."""
+    import pygame
+    img = pygame.image.load(path)
+    if img.get_flags() & pygame.SRCALPHA:
+        values = pygame.surfarray.array_alpha(img)
+    else:
+        values = pygame.surfarray.array3d(img).mean(axis=2)
+    return MaskShape(values.T >= threshold, x_min, y_max, px_per_m)  # surfarray is (x, y)
+
+def load_raw(path, width, height, px_per_m=1.0, x_min=0.0, y_max=SURFACE_Y_WORLD, dtype=np.uint8):
+    """MaskShape from a headerless row-major file of width × height values (nonzero = ore)."""
+    values = np.fromfile(path, dtype=dtype, count=width * height)
+    if values.size != width * height:
+        raise ValueError(f"{path}: expected {width * height} values, got {values.size}")
+    return MaskShape(values.reshape(height, width) != 0, x_min, y_max, px_per_m)
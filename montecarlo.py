@@ -0,0 +1,73 @@
+# montecarlo.py
+# Monte Carlo hit-probability engine: how likely is a hit on a round when the drill is
+# aimed at a given angle but aiming, collar position and the hole itself all carry error?
+# Samples are resolved in chunks through batch.ray_circle_hits. Requires numpy.
+
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+from core import SURFACE_Y_WORLD, ANGLE_MIN, ANGLE_MAX
+from batch import ray_circle_hits
+
+@dataclass(frozen=True)
+class ErrorModel:
+    """Independent Gaussian error sources (1 sigma)."""
+    aim_sigma_deg: float = 1.0        # player aiming error
+    collar_sigma_m: float = 0.0       # collar (origin_x) position jitter
+    deviation_sigma_deg: float = 0.0  # hole deviation, modelled as an extra angular offset
+
+@dataclass(frozen=True)
+class HitEstimate:
+    p: float          # estimated hit probability
+    lo: float         # confidence interval bounds (Wilson score)
+    hi: float
+    hits: int
+    samples: int
+    confidence: float
+
+def aim_angle(g):
+    """Angle (deg) pointing from the collar straight at the target centre."""
+    return math.degrees(math.atan2(g.target_y - SURFACE_Y_WORLD, g.target_x - g.origin_x))
+
+def wilson_interval(hits, n, confidence=0.95):
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+    p = hits / n
+    denom = 1.0 + z*z / n
+    centre = (p + z*z / (2*n)) / denom
+    half = z * math.sqrt(p * (1.0 - p) / n + z*z / (4*n*n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+def hit_probability(g, angle=None, model=ErrorModel(), samples=1_000_000, chunk=262_144,
+                    seed=None, confidence=0.95):
+    """Estimate P(hit) for round `g` (anything with origin_x, target_x, target_y and
+       target_radius, e.g. a Game) aimed at `angle` (default: straight at the target)."""
+    if angle is None:
+        angle = aim_angle(g)
+    rng = np.random.default_rng(seed)
+    center = np.array([[g.target_x, g.target_y]])
+    radius = np.array([g.target_radius])
+    hits = 0
+    done = 0
+    while done < samples:
+        n = min(chunk, samples - done)
+        angles = np.full(n, float(angle))
+        if model.aim_sigma_deg:
+            angles += rng.normal(0.0, model.aim_sigma_deg, n)
+        # The handle can't be set outside its clamp
+        np.clip(angles, ANGLE_MIN, ANGLE_MAX, out=angles)
+        if model.deviation_sigma_deg:
+            angles += rng.normal(0.0, model.deviation_sigma_deg, n)
+        origins = np.empty((n, 2))
+        origins[:, 0] = g.origin_x
+        origins[:, 1] = SURFACE_Y_WORLD
+        if model.collar_sigma_m:
+            origins[:, 0] += rng.normal(0.0, model.collar_sigma_m, n)
+        hits += int(ray_circle_hits(origins, angles, center, radius).hit.sum())
+        done += n
+    lo, hi = wilson_interval(hits, samples, confidence)
+    return HitEstimate(hits / samples if samples else 0.0, lo, hi, hits, samples, confidence)
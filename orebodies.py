@@ -0,0 +1,128 @@
+# orebodies.py
+# Multi-orebody sections: many orebodies behind a uniform-grid spatial index. A drill ray
+# walks only the grid cells it crosses (Amanatides–Woo traversal) and tests the shapes
+# registered in them, so ray cost grows with the cells crossed rather than the number of
+# orebodies. Orebodies are shapes.Shape objects; plain (x, y, r) tuples become Circles.
+# Pure Python, no pygame/numpy.
+
+import math
+from dataclasses import dataclass
+
+from core import grid_walk
+from shapes import Shape, Circle, _slab
+
+@dataclass(frozen=True)
+class Intercept:
+    index: int      # orebody index in OrebodyIndex.shapes
+    t_in: float     # distance along the ray where the drill enters (clipped to >= 0)
+    t_out: float    # ... and leaves (trace() clips this to the trace length)
+
+@dataclass(frozen=True)
+class TraceResult:
+    first: Intercept          # first orebody hit (None if none)
+    hits: tuple               # every Intercept along the trace, by t_in
+    intercepted_length: float # metres inside any orebody (overlaps counted once)
+
+class OrebodyIndex:
+    """Uniform grid over a list of orebodies (Shapes or (x, y, r) circles) in world coords."""
+    def __init__(self, orebodies, cell_size=None):
+        self.shapes = [o if isinstance(o, Shape) else Circle(*o) for o in orebodies]
+        if not self.shapes:
+            raise ValueError("OrebodyIndex needs at least one orebody")
+        boxes = [s.bbox() for s in self.shapes]
+        self.x_min = min(b[0] for b in boxes)
+        self.x_max = max(b[1] for b in boxes)
+        self.y_min = min(b[2] for b in boxes)
+        self.y_max = max(b[3] for b in boxes)
+        if cell_size is None:
+            # About one orebody per cell, but never smaller than a typical orebody
+            area = (self.x_max - self.x_min) * (self.y_max - self.y_min)
+            mean_size = sum(max(b[1] - b[0], b[3] - b[2]) for b in boxes) / len(boxes)
+            cell_size = max(mean_size, math.sqrt(area / len(self.shapes)))
+        self.cell = float(cell_size)
+        self.nx = max(1, math.ceil((self.x_max - self.x_min) / self.cell))
+        self.ny = max(1, math.ceil((self.y_max - self.y_min) / self.cell))
+        self.cells = {}
+        for k, (x0, x1, y0, y1) in enumerate(boxes):
+            i0, j0 = self._cell_of(x0, y0)
+            i1, j1 = self._cell_of(x1, y1)
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    self.cells.setdefault((i, j), []).append(k)
+
+    @classmethod
+    def from_round(cls, g, extra=(), cell_size=None):
+        """Index holding the round's own target plus `extra` (x, y, r) orebodies."""
+        return cls([(g.target_x, g.target_y, g.target_radius), *extra], cell_size)
+
+    def bounds(self):
+        return self.x_min, self.x_max, self.y_min, self.y_max
+
+    def _cell_of(self, x, y):
+        i = min(self.nx - 1, max(0, int((x - self.x_min) // self.cell)))
+        j = min(self.ny - 1, max(0, int((y - self.y_min) // self.cell)))
+        return i, j
+
+    def cells_along(self, p0, d, t_max=math.inf):
+        """Yield (t_enter, t_exit, orebody indices) for each grid cell the ray
+           p0 + t*d crosses for 0 <= t <= t_max, in order."""
+        for i, j, t, t_exit in grid_walk(p0, d, t_max, self.x_min, self.y_min, self.cell, self.nx, self.ny):
+            members = self.cells.get((i, j))
+            if members:
+                yield t, t_exit, members
+
+    def _interval(self, k, p0, d, t_max):
+        span = self.shapes[k].ray_interval(p0, d, t_max)
+        return Intercept(k, *span) if span is not None else None
+
+    def _crossings(self, k, p0, d, t_max):
+        # Every crossing of orebody k within [0, t_max]: a concave orebody can be
+        # entered more than once, and ray_interval() only reports the first
+        shape = self.shapes[k]
+        if not _slab(p0, d, shape.bbox(), t_max):
+            return []
+        return [Intercept(k, max(t_in, 0.0), min(t_out, t_max))
+                for t_in, t_out in shape.intervals(p0, d) if t_out >= 0.0 and t_in <= t_max]
+
+    def first_hit(self, p0, d, t_max=math.inf):
+        """First Intercept along the ray within t_max (None if the drill hits nothing).
+           Stops walking as soon as no later cell can hold an earlier hit."""
+        seen = set()
+        best = None
+        for _, t_exit, members in self.cells_along(p0, d, t_max):
+            for k in members:
+                if k in seen:
+                    continue
+                seen.add(k)
+                hit = self._interval(k, p0, d, t_max)
+                if hit is not None and (best is None or hit.t_in < best.t_in):
+                    best = hit
+            if best is not None and best.t_in <= t_exit:
+                break
+        return best
+
+    def trace(self, p0, d, t_max):
+        """Every orebody crossing along the ray over [0, t_max], one Intercept per
+           crossing (a concave orebody can appear more than once)."""
+        seen = set()
+        hits = []
+        for _, _, members in self.cells_along(p0, d, t_max):
+            for k in members:
+                if k in seen:
+                    continue
+                seen.add(k)
+                hits.extend(self._crossings(k, p0, d, t_max))
+        hits.sort(key=lambda h: h.t_in)
+        # Union of the intervals so overlapping orebodies aren't counted twice
+        length = 0.0
+        cur_in = cur_out = None
+        for h in hits:
+            if cur_out is None or h.t_in > cur_out:
+                if cur_out is not None:
+                    length += cur_out - cur_in
+                cur_in, cur_out = h.t_in, h.t_out
+            else:
+                cur_out = max(cur_out, h.t_out)
+        if cur_out is not None:
+            length += cur_out - cur_in
+        return TraceResult(hits[0] if hits else None, tuple(hits), length)
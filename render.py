@@ -0,0 +1,582 @@
+# render.py
+# pygame renderer for "Guess the Angle": screen layout, cached text, the static background
+# layer, dirty-rect pipeline and idle-aware frame scheduling. Imported lazily by main().
+# World units: 1 px = 1 m. Screen uses a world->screen transform that flips Y so negative
+# depth draws downward (as geos prefer: up = +, down = -).
+
+import math
+import time
+import weakref
+from collections import OrderedDict
+import pygame
+
+from core import (SURFACE_Y_WORLD, MAX_DEPTH_WORLD, DRILL_COST_PER_METER, DRILL_COST_BUDGET,
+                  deg2rad, format_round_id, Game)
+from shapes import Circle
+
+# ----------------- Screen config -----------------
+PX_PER_M = 1.0          # 1 px = 1 m (as requested)
+MARGIN_L, MARGIN_R = 120, 120
+MARGIN_T, MARGIN_B = 20, -60
+
+# Screen size chosen to comfortably show 0..1000 m in X and ~900 m depth in Y
+SCREEN_W = int(MARGIN_L + 1000 * PX_PER_M + MARGIN_R)
+SCREEN_H = int(MARGIN_T + (abs(MAX_DEPTH_WORLD) + 120) * PX_PER_M + MARGIN_B)
+
+# Surface handle: the small visible polyline length at surface
+HANDLE_LEN = 20.0  # m
+
+# Colors
+BG = (10, 18, 32)
+PANEL = (16, 26, 43)
+GRID = (27, 41, 66)
+INK = (231, 238, 247)
+MUTED = (160, 177, 196)
+GREEN = (30, 132, 73)
+LGREEN = (46, 204, 113)
+RED = (255, 107, 107)
+YELLOW = (255, 209, 102)
+ACCENT = (76, 195, 138)
+WHITE = (240, 244, 252)
+
+def world_to_screen(wx, wy):
+    """Flip Y so world up (+) draws upward; surface (0) near top margin."""
+    sx = int(MARGIN_L + wx * PX_PER_M)
+    sy = int(MARGIN_T + (-wy) * PX_PER_M)   # minus because wy<0 should be lower on screen
+    return sx, sy
+
+# ----------------- Drawing -----------------
+def draw_grid(screen):
+    w, h = screen.get_size()
+    # back panels
+    screen.fill(BG)
+    pygame.draw.rect(screen, PANEL, (0, 0, 280, h))
+    pygame.draw.rect(screen, PANEL, (w-280, 0, 280, h))
+    # center
+    pygame.draw.rect(screen, (15, 23, 38), (280, 0, w-560, h))
+    # grid
+    for x in range(300, w-300, 50):
+        pygame.draw.line(screen, GRID, (x, 40), (x, h-50), 1)
+    for y in range(40, h-50, 50):
+        pygame.draw.line(screen, GRID, (300, y), (w-300, y), 1)
+
+def draw_static_scene(screen):
+    """Parts of the section view that never change during a session."""
+    # Surface line (world y=0)
+    sx1, sy1 = world_to_screen(0, SURFACE_Y_WORLD)
+    sx2, sy2 = world_to_screen(1000, SURFACE_Y_WORLD)
+    pygame.draw.line(screen, (70, 95, 130), (sx1, sy1), (sx2, sy2), 2)
+    # Labels
+    text(screen, "Section view — 1 px = 1 m (world y negative is down)", screen.get_width()//2, 30, MUTED, 14, center=True)
+
+def draw_historical_holes(screen, holes):
+    """Imported (desurveyed) holes as thin polylines in world coords."""
+    for line in holes:
+        pygame.draw.lines(screen, MUTED, False, [world_to_screen(x, y) for x, y in line], 1)
+
+class Background:
+    """Offscreen copy of the static layer (panels, grid, surface line, section label,
+       historical holes). Built once and blitted each frame; rebuilt only when the
+       screen size, PX_PER_M or the set of historical holes changes."""
+    def __init__(self):
+        self.surface = None
+        self.holes = None
+        self._key = None
+        self.builds = 0
+
+    def _build(self, screen):
+        surf = pygame.Surface(screen.get_size())
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert(screen)
+        draw_grid(surf)
+        draw_static_scene(surf)
+        if self.holes:
+            draw_historical_holes(surf, self.holes)
+        self.surface = surf
+        self.builds += 1
+
+    def invalidate(self):
+        self._key = None
+
+    def blit(self, screen, rect=None):
+        """Blit the whole layer, or only `rect` of it when restoring a dirty region."""
+        key = (screen.get_size(), PX_PER_M, id(self.holes))
+        if key != self._key:
+            self._build(screen)
+            self._key = key
+        if rect is None:
+            screen.blit(self.surface, (0, 0))
+        else:
+            screen.blit(self.surface, rect.topleft, rect)
+
+# ----------------- Text cache -----------------
+class TextCache:
+    """Font registry keyed by (family, size, bold) plus a bounded LRU of rendered
+       text surfaces keyed by (string, color, size, bold). The panels redraw the
+       same strings every frame, so a steady-state frame should be all hits."""
+    def __init__(self, family="arial", max_surfaces=256):
+        self.family = family
+        self.max_surfaces = max_surfaces
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.font_hits = 0
+        self.font_misses = 0  # == number of SysFont constructions
+        self.surface_hits = 0
+        self.surface_misses = 0
+
+    def font(self, size, bold=False, family=None):
+        key = (family or self.family, size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            self.font_misses += 1
+            font = pygame.font.SysFont(key[0], size, bold=bold)
+            self._fonts[key] = font
+        else:
+            self.font_hits += 1
+        return font
+
+    def render(self, s, color, size, bold=False):
+        key = (s, tuple(color), size, bold)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.surface_hits += 1
+            return surf
+        self.surface_misses += 1
+        surf = self.font(size, bold).render(s, True, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_surfaces:
+            self._surfaces.popitem(last=False)  # evict least recently used
+        return surf
+
+    def clear(self):
+        self._fonts.clear()
+        self._surfaces.clear()
+
+    def stats(self):
+        return {
+            "fonts": len(self._fonts),
+            "font_hits": self.font_hits,
+            "font_misses": self.font_misses,
+            "surfaces": len(self._surfaces),
+            "surface_hits": self.surface_hits,
+            "surface_misses": self.surface_misses,
+        }
+
+TEXT_CACHE = TextCache()
+
+def text(screen, s, x, y, color=INK, size=18, bold=False, center=False):
+    surf = TEXT_CACHE.render(s, color, size, bold)
+    rect = surf.get_rect()
+    if center:
+        rect.center = (x, y)
+    else:
+        rect.topleft = (x, y)
+    screen.blit(surf, rect)
+
+def draw_left_panel(screen, g: Game):
+    text(screen, "Guess the Angle", 20, 16, INK, 22, True)
+    text(screen, "Rotate the small surface line, then DRILL.", 20, 44, MUTED, 16)
+    text(screen, "Controls", 20, 84, INK, 18, True)
+    text(screen, "Left/Right: ±1°", 20, 110, MUTED, 16)
+    text(screen, "Space: DRILL        N: new round", 20, 132, MUTED, 16)
+    text(screen, "Angle clamp: -180° .. 0°", 20, 154, MUTED, 16)
+
+    # Angle readout
+    text(screen, "Angle", 20, 198, INK, 16, True)
+    text(screen, f"{g.angle:6.1f}°", 20, 222, ACCENT, 28, True)
+
+    # 1° helper at target depth
+    target_depth = int(abs(g.target_y))
+    text(screen, f"1° miss @ {target_depth} m", 20, 272, INK, 16, True)
+    miss_1deg = math.tan(math.radians(1.0)) * abs(g.target_y)
+    text(screen, f"≈ {miss_1deg:.2f} m", 20, 294, MUTED, 18)
+
+    # Tries remaining
+    text(screen, "Tries", 20, 344, INK, 16, True)
+    tries_col = ACCENT if g.tries_remaining > 0 else RED
+    text(screen, f"{g.tries_remaining}/3", 20, 368, tries_col, 18, True)
+    
+    # State
+    text(screen, "State", 20, 404, INK, 16, True)
+    st_col = ACCENT if g.state == "aim" else (YELLOW if g.state == "drilling" else (ACCENT if g.state=="win" else RED))
+    text(screen, g.state.upper(), 20, 428, st_col, 18, True)
+
+def draw_right_panel(screen, g: Game):
+    text(screen, "Round Info", SCREEN_W-260, 16, INK, 20, True)
+    text(screen, f"Target depth: {int(abs(g.target_y))} m", SCREEN_W-260, 46, MUTED, 16)
+    text(screen, f"Target X: {int(g.target_x)} m", SCREEN_W-260, 66, MUTED, 16)
+    text(screen, f"Radius: {int(g.target_radius)} m", SCREEN_W-260, 86, MUTED, 16)
+    text(screen, f"Round ID: {format_round_id(g.round_id)}", SCREEN_W-260, 106, MUTED, 12)
+    if g.state in ("win", "lose"):
+        if g.state == "win":
+            text(screen, "Result: HIT!", SCREEN_W-260, 128, ACCENT, 20, True)
+        else:
+            text(screen, "Result: MISS", SCREEN_W-260, 128, RED, 20, True)
+            # Show tries remaining
+            if g.tries_remaining > 0:
+                text(screen, f"Tries left: {g.tries_remaining}", SCREEN_W-260, 156, YELLOW, 16, True)
+                text(screen, "Press SPACE to try again", SCREEN_W-260, 178, MUTED, 14, True)
+            else:
+                text(screen, "No tries left", SCREEN_W-260, 156, RED, 16, True)
+                text(screen, "Press N for new round", SCREEN_W-260, 178, MUTED, 14, True)
+        # Show miss distance if MISS. A block-model round has no single target to miss, and
+        # a multi-orebody round only has a figure when every orebody could measure it
+        measured = g.drill_result.miss_distance if g.drill_result is not None else None
+        if g.state == "lose" and g.block_model is None and (g.orebodies is None or measured is not None):
+            # compute minimum distance from extended ray to circle center at the bottom of path
+            # (since we already animate to max depth, we can compute delta at x = target_x)
+            theta = deg2rad(g.angle)
+            if measured is not None:
+                # Measured at resolve time (e.g. a bitmap orebody's cached distance field)
+                delta = measured
+            # Handle vertical line (-90°): miss is horizontal distance
+            elif abs(g.angle - (-90.0)) < 0.001:
+                delta = abs(g.target_x - g.origin_x)
+            else:
+                # y at target_x using the ray
+                y_at_tx = SURFACE_Y_WORLD + math.tan(theta) * (g.target_x - g.origin_x)
+                delta = abs(y_at_tx - g.target_y)
+            # Position miss distance below tries message if tries remain, otherwise below "Press N for new round"
+            miss_y = 200 if g.tries_remaining > 0 else 200
+            text(screen, f"Δ miss: {delta:.2f} m", SCREEN_W-260, miss_y, YELLOW, 18, True)
+        
+        # Show drill cost information when drilling is complete
+        if g.state in ("win", "lose") and g.drill_path_length > 0:
+            # Calculate starting Y position based on state and messages above
+            if g.state == "win":
+                y_pos = 160  # Below "Result: HIT!"
+            else:  # lose
+                # Both cases: miss distance is at 200, so start cost info at 222
+                y_pos = 222  # Below miss distance (which is at 200)
+            
+            text(screen, f"Path length: {g.drill_path_length:.2f} m", SCREEN_W-260, y_pos, MUTED, 16, True)
+            cost_color = RED if g.state == "lose" else ACCENT
+            text(screen, f"This attempt: ${g.total_cost:,.2f}", SCREEN_W-260, y_pos + 22, cost_color, 18, True)
+            text(screen, f"(${DRILL_COST_PER_METER:.2f}/m)", SCREEN_W-260, y_pos + 44, MUTED, 14, True)
+            gt = g.drill_result.grade if g.drill_result is not None else None
+            if gt is not None:
+                # Block-model score: value intercepted minus drilling cost
+                score_color = ACCENT if gt.score > 0 else RED
+                text(screen, f"Metal: {gt.metal:,.1f} g/t·m  Value: ${gt.value:,.0f}", SCREEN_W-260, y_pos + 160, MUTED, 14, True)
+                text(screen, f"Score: ${gt.score:,.2f}", SCREEN_W-260, y_pos + 178, score_color, 18, True)
+            # Show accumulated cost across all tries
+            if g.accumulated_cost > 0:
+                acc_cost_color = RED if g.state == "lose" and g.tries_remaining == 0 else (ACCENT if g.state == "win" else YELLOW)
+                text(screen, f"Accumulated: ${g.accumulated_cost:,.2f}", SCREEN_W-260, y_pos + 66, acc_cost_color, 18, True)
+                # Show budget status
+                budget_diff = DRILL_COST_BUDGET - g.accumulated_cost
+                if budget_diff >= 0:
+                    text(screen, f"Budget: ${DRILL_COST_BUDGET:,.2f}", SCREEN_W-260, y_pos + 88, MUTED, 16, True)
+                    text(screen, f"Under budget: ${budget_diff:,.2f}", SCREEN_W-260, y_pos + 110, ACCENT, 18, True)
+                else:
+                    text(screen, f"Budget: ${DRILL_COST_BUDGET:,.2f}", SCREEN_W-260, y_pos + 88, MUTED, 16, True)
+                    text(screen, f"Over budget: ${abs(budget_diff):,.2f}", SCREEN_W-260, y_pos + 110, RED, 18, True)
+                    text(screen, "Team is losing money!", SCREEN_W-260, y_pos + 132, RED, 16, True)
+    else:
+        text(screen, "Press SPACE to drill", SCREEN_W-260, 128, INK, 18, True)
+        # Show budget if no attempts yet
+        if g.accumulated_cost == 0 and g.tries_remaining == 3:
+            text(screen, f"Budget: ${DRILL_COST_BUDGET:,.2f}", SCREEN_W-260, 156, MUTED, 16, True)
+        # Show tries remaining if they've used some
+        elif g.tries_remaining < 3:
+            text(screen, f"Tries left: {g.tries_remaining}/3", SCREEN_W-260, 156, YELLOW, 16, True)
+            # Show accumulated cost if there have been attempts
+            if g.accumulated_cost > 0:
+                text(screen, f"Accumulated: ${g.accumulated_cost:,.2f}", SCREEN_W-260, 178, YELLOW, 18, True)
+                # Show budget status
+                budget_diff = DRILL_COST_BUDGET - g.accumulated_cost
+                if budget_diff >= 0:
+                    text(screen, f"Budget: ${DRILL_COST_BUDGET:,.2f}", SCREEN_W-260, 200, MUTED, 16, True)
+                    text(screen, f"Under budget: ${budget_diff:,.2f}", SCREEN_W-260, 222, ACCENT, 18, True)
+                else:
+                    text(screen, f"Budget: ${DRILL_COST_BUDGET:,.2f}", SCREEN_W-260, 200, MUTED, 16, True)
+                    text(screen, f"Over budget: ${abs(budget_diff):,.2f}", SCREEN_W-260, 222, RED, 18, True)
+                    text(screen, "Team is losing money!", SCREEN_W-260, 244, RED, 16, True)
+
+def draw_orebody(screen, x, y, r):
+    tx, ty = world_to_screen(x, y)
+    r = max(1, int(r))
+    pygame.draw.circle(screen, LGREEN, (tx, ty), r, 0)
+    pygame.draw.circle(screen, GREEN, (tx, ty), r, min(3, r))
+
+_BLOCK_LAYER = {}  # id(block model) -> (model, view key, Surface, topleft); one entry
+
+def block_layer(model, size):
+    """Grade-coloured Surface covering just the part of a block model visible on a
+       screen of `size`, built once per model/view. Only visible blocks are read (one
+       per pixel at most), so a memory-mapped model pages in the viewport's tiles and no
+       more. Zero-grade blocks are transparent so the grid shows through."""
+    key = (size, PX_PER_M)
+    hit = _BLOCK_LAYER.get(id(model))
+    if hit is not None and hit[0] is model and hit[1] == key:
+        return hit[2], hit[3]
+    import numpy as np
+    # Visible world window -> block rows/cols
+    w, h = size
+    vx0, vx1 = -MARGIN_L / PX_PER_M, (w - MARGIN_L) / PX_PER_M
+    vy1, vy0 = MARGIN_T / PX_PER_M, (MARGIN_T - h) / PX_PER_M
+    col0 = max(0, int((vx0 - model.x_min) // model.cell))
+    col1 = min(model.nx, int(math.ceil((vx1 - model.x_min) / model.cell)))
+    row0 = max(0, int((model.y_max - vy1) // model.cell))
+    row1 = min(model.ny, int(math.ceil((model.y_max - vy0) / model.cell)))
+    if col1 <= col0 or row1 <= row0:
+        surf, topleft = pygame.Surface((1, 1)), (0, 0)
+        surf.set_colorkey(surf.get_at((0, 0)))
+    else:
+        step = max(1, int(1.0 / (model.cell * PX_PER_M)))  # blocks smaller than a pixel
+        grade = model.window(row0, row1, col0, col1, step).astype(np.float32)
+        top = float(grade.max())
+        u = np.clip(grade / top, 0.0, 1.0) if top > 0.0 else np.zeros_like(grade)
+        lo, hi = np.array((30, 60, 60), np.float32), np.array(YELLOW, np.float32)
+        rgb = (lo + (hi - lo) * u[..., None]).astype(np.uint8)
+        rgb[grade <= 0.0] = (0, 0, 0)
+        surf = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))  # surfarray is (x, y)
+        surf.set_colorkey((0, 0, 0))
+        span = ((col1 - col0) * model.cell * PX_PER_M, (row1 - row0) * model.cell * PX_PER_M)
+        surf = pygame.transform.scale(surf, (max(1, round(span[0])), max(1, round(span[1]))))
+        topleft = world_to_screen(model.x_min + col0 * model.cell, model.y_max - row0 * model.cell)
+    _BLOCK_LAYER.clear()
+    _BLOCK_LAYER[id(model)] = (model, key, surf, topleft)
+    return surf, topleft
+
+# shape -> (PX_PER_M, Surface, world top-left); one entry per live shape, dropped with it
+_RASTER_LAYER = weakref.WeakKeyDictionary()
+
+def raster_layer(shape):
+    """Screen-scale Surface of an orebody that has no polygon outline: a bitmap
+       (masks.MaskShape) as stored, an SDF (sdf.SdfShape) by sampling its distance at
+       every pixel. Built once per shape; returns (Surface, world top-left)."""
+    hit = _RASTER_LAYER.get(shape)
+    if hit is not None and hit[0] == PX_PER_M:
+        return hit[1], hit[2]
+    import numpy as np
+    if getattr(shape, "mask", None) is not None:
+        inside, topleft = shape.mask, (shape.x_min, shape.y_max)
+        size = (shape.nx * shape.px * PX_PER_M, shape.ny * shape.px * PX_PER_M)
+    else:
+        x0, x1, y0, y1 = shape.bbox()
+        px = 1.0 / PX_PER_M
+        xs = x0 + (np.arange(max(1, math.ceil((x1 - x0) / px))) + 0.5) * px
+        ys = y1 - (np.arange(max(1, math.ceil((y1 - y0) / px))) + 0.5) * px
+        gx, gy = np.meshgrid(xs, ys)
+        inside = shape.signed_distance_batch(np.stack((gx, gy), axis=-1)) <= 0.0
+        topleft = (x0, y1)
+        size = (len(xs), len(ys))
+    rgb = np.zeros(inside.shape + (3,), np.uint8)
+    rgb[inside] = LGREEN
+    surf = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))  # surfarray is (x, y)
+    surf.set_colorkey((0, 0, 0))
+    surf = pygame.transform.scale(surf, (max(1, round(size[0])), max(1, round(size[1]))))
+    _RASTER_LAYER[shape] = (PX_PER_M, surf, topleft)
+    return surf, topleft
+
+def draw_block_model(screen, model):
+    surf, topleft = block_layer(model, screen.get_size())
+    screen.blit(surf, topleft)
+
+def draw_scene(screen, g: Game, tip=None):
+    # Surface line and section label live in the Background layer
+
+    # Origin marker
+    origin = g.get_origin()
+    ox, oy = world_to_screen(*origin)
+    pygame.draw.circle(screen, WHITE, (ox, oy), 5)
+
+    # Small surface handle line (20 m) showing current angle; visible only at surface
+    # Direction from angle
+    theta = deg2rad(g.angle)
+    hx = g.origin_x + math.cos(theta) * HANDLE_LEN
+    hy = SURFACE_Y_WORLD + math.sin(theta) * HANDLE_LEN
+    h1 = world_to_screen(g.origin_x, SURFACE_Y_WORLD)
+    h2 = world_to_screen(hx, hy)
+    pygame.draw.line(screen, WHITE, h1, h2, 3)
+
+    # Target orebody (circle), or every orebody in a multi-orebody round;
+    # a block-model round shows its grades instead
+    if g.block_model is not None:
+        draw_block_model(screen, g.block_model)
+    elif g.orebodies is None:
+        draw_orebody(screen, g.target_x, g.target_y, g.target_radius)
+    else:
+        for shape in g.orebodies.shapes:
+            if isinstance(shape, Circle):
+                draw_orebody(screen, shape.cx, shape.cy, shape.r)
+            elif getattr(shape, "mask", None) is not None or getattr(shape, "node", None) is not None:
+                surf, topleft = raster_layer(shape)
+                screen.blit(surf, world_to_screen(*topleft))
+            else:
+                pts = [world_to_screen(x, y) for x, y in shape.outline()]
+                pygame.draw.polygon(screen, LGREEN, pts, 0)
+                pygame.draw.polygon(screen, GREEN, pts, 2)
+
+    # If drilling or finished, draw the drill trace (animated)
+    if g.state in ("drilling", "win", "lose"):
+        path = g.drill_result.path if g.drill_result is not None else None
+        if path is not None:
+            # Curved hole: polyline up to the current along-hole depth
+            pts, _ = path.trace_upto(g.drill_path_length)
+            pygame.draw.lines(screen, RED, False, [world_to_screen(x, y) for x, y in pts], 3)
+        else:
+            # Draw segment from origin to current drill tip
+            dx, dy = world_to_screen(*(tip or g.drill_tip))
+            pygame.draw.line(screen, RED, (ox, oy), (dx, dy), 3)
+        # If win, draw a small highlight at intersection
+        if g.state == "win" and g.result_point:
+            ix, iy = world_to_screen(*g.result_point)
+            pygame.draw.circle(screen, ACCENT, (ix, iy), 6)
+
+# ----------------- Dirty-rect rendering -----------------
+DEBUG_DIRTY_RECTS = False  # outline pushed rects (toggle with F3)
+
+def dirty_regions(g: Game, tip=None):
+    """Screen regions that can change between frames, as {name: (key, rect)}.
+       A region is redrawn only when its key differs from the previous frame."""
+    ox, oy = world_to_screen(*g.get_origin())
+    handle_r = int(HANDLE_LEN * PX_PER_M) + 8
+    if g.block_model is not None or g.orebodies is not None:
+        x0, x1, y0, y1 = (g.block_model or g.orebodies).bounds()
+        (sx0, sy0), (sx1, sy1) = world_to_screen(x0, y1), world_to_screen(x1, y0)
+        target_rect = pygame.Rect(sx0, sy0, sx1 - sx0, sy1 - sy0).inflate(8, 8)
+    else:
+        tx, ty = world_to_screen(g.target_x, g.target_y)
+        target_r = int(g.target_radius) + 4
+        target_rect = pygame.Rect(tx - target_r, ty - target_r, 2*target_r, 2*target_r)
+    regions = {
+        "angle": (g.angle, pygame.Rect(0, 196, 280, 64)),
+        "status": ((g.target_y, g.tries_remaining, g.state),
+                   pygame.Rect(0, 268, 280, 190)),
+        "handle": ((g.origin_x, g.angle), pygame.Rect(ox - handle_r, oy - handle_r, 2*handle_r, 2*handle_r)),
+        "target": ((g.target_x, g.target_y, g.target_radius, id(g.orebodies), id(g.block_model)), target_rect),
+        # Path length only shows once the attempt is resolved, so drilling frames leave it alone
+        "result": ((g.state, g.tries_remaining, g.accumulated_cost,
+                    g.target_x, g.target_y, g.target_radius, g.origin_x,
+                    g.drill_path_length if g.state in ("win", "lose") else None,
+                    g.angle if g.state == "lose" else None,
+                    g.drill_result.miss_distance if g.drill_result is not None else None),
+                   pygame.Rect(SCREEN_W-280, 0, 280, SCREEN_H)),
+    }
+    if g.state in ("drilling", "win", "lose"):
+        path = g.drill_result.path if g.drill_result is not None else None
+        if path is not None:
+            tip = g.drill_tip
+            _, (x0, x1, y0, y1) = path.trace_upto(g.drill_path_length)
+            (sx0, sy0), (sx1, sy1) = world_to_screen(x0, y1), world_to_screen(x1, y0)
+            trace = pygame.Rect(sx0, sy0, sx1 - sx0, sy1 - sy0).inflate(16, 16)
+        else:
+            tip = tip or g.drill_tip
+            dx, dy = world_to_screen(*tip)
+            trace = pygame.Rect(min(ox, dx), min(oy, dy), abs(dx - ox), abs(dy - oy)).inflate(16, 16)
+        regions["trace"] = ((tip, g.state, g.origin_x), trace)
+    else:
+        regions["trace"] = (None, pygame.Rect(0, 0, 0, 0))
+    return regions
+
+class RenderPipeline:
+    """Redraws only the regions whose state changed and pushes just those rects
+       through pygame.display.update(). A full frame is drawn on the first call
+       and after invalidate() (window exposed, background rebuilt, ...)."""
+    def __init__(self, background, debug=DEBUG_DIRTY_RECTS):
+        self.background = background
+        self.debug = debug
+        self._keys = None
+        self._rects = {}
+        self._overlay = []
+        self.frames = 0
+        self.pixels_pushed = 0
+
+    def invalidate(self):
+        self._keys = None
+
+    def _draw(self, screen, g, tip, rect=None):
+        screen.set_clip(rect)
+        self.background.blit(screen, rect)
+        draw_left_panel(screen, g)
+        draw_right_panel(screen, g)
+        draw_scene(screen, g, tip)
+        screen.set_clip(None)
+
+    def render(self, screen, g, tip=None):
+        """`tip` overrides g.drill_tip for drawing (interpolated between sim ticks)."""
+        if g.historical_holes is not self.background.holes:
+            # Holes are baked into the background, so a new set means a full redraw
+            self.background.holes = g.historical_holes
+            self.invalidate()
+        regions = dirty_regions(g, tip)
+        self.frames += 1
+        if self._keys is None:
+            self._draw(screen, g, tip)
+            pygame.display.flip()
+            self.pixels_pushed += screen.get_width() * screen.get_height()
+            self._overlay = []
+        else:
+            dirty = list(self._overlay)  # erase last frame's debug outlines
+            for name, (key, rect) in regions.items():
+                if key != self._keys.get(name):
+                    # Old rect clears what was there, new rect paints the new state
+                    dirty.append(self._rects[name])
+                    if rect != self._rects[name]:
+                        dirty.append(rect)
+            dirty = [r.clip(screen.get_rect()) for r in dirty if r.width and r.height]
+            for rect in dirty:
+                self._draw(screen, g, tip, rect)
+            self._overlay = []
+            if self.debug:
+                for rect in dirty:
+                    pygame.draw.rect(screen, YELLOW, rect, 1)
+                self._overlay = dirty
+            if dirty:
+                pygame.display.update(dirty)
+                self.pixels_pushed += sum(r.width * r.height for r in dirty)
+        self._keys = {name: key for name, (key, _) in regions.items()}
+        self._rects = {name: rect for name, (_, rect) in regions.items()}
+
+# ----------------- Frame scheduling -----------------
+ACTIVE_FPS = 60       # frame rate while the drill is animating
+IDLE_WAIT_MS = 1000   # longest block on the event queue in idle states
+
+class CpuMeter:
+    """Process CPU time as a percentage of wall time, refreshed every `window` seconds."""
+    def __init__(self, window=1.0):
+        self.window = window
+        self.percent = 0.0
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def sample(self):
+        wall = time.perf_counter()
+        if wall - self._wall < self.window:
+            return False
+        cpu = time.process_time()
+        self.percent = 100.0 * (cpu - self._cpu) / (wall - self._wall)
+        self._wall, self._cpu = wall, cpu
+        return True
+
+class FrameScheduler:
+    """Full frame rate while drilling; in idle states (aim/win/lose) block on the
+       event queue so the process sleeps until input arrives."""
+    def __init__(self, fps=ACTIVE_FPS, idle_wait_ms=IDLE_WAIT_MS):
+        self.fps = fps
+        self.idle_wait_ms = idle_wait_ms
+        self.clock = pygame.time.Clock()
+        self.cpu = CpuMeter()
+        self.active_frames = 0
+        self.idle_wakeups = 0
+
+    def wait(self, g: Game):
+        """Return (dt, events) for the next frame."""
+        if g.state == "drilling":
+            self.active_frames += 1
+            dt = self.clock.tick(self.fps) / 1000.0
+            return dt, pygame.event.get()
+        event = pygame.event.wait(self.idle_wait_ms)
+        self.idle_wakeups += 1
+        # Reset the clock so the first drilling frame doesn't see the idle time as dt
+        self.clock.tick()
+        events = pygame.event.get()
+        if event.type != pygame.NOEVENT:
+            events.insert(0, event)
+        return 0.0, events
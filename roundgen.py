@@ -0,0 +1,71 @@
+# roundgen.py
+# Difficulty-filtered round generation by vectorized rejection sampling: candidate rounds
+# are drawn in large NumPy batches (batch.generate_rounds), scored by hit-window width and
+# optimal-shot cost, and kept only if they fall in the requested DifficultyBand.
+# Accepted rounds keep their round IDs, so each one can be replayed with Game.reset_round.
+# Requires numpy.
+
+from typing import NamedTuple
+
+import numpy as np
+
+from core import SURFACE_Y_WORLD, DRILL_COST_PER_METER, DifficultyBand
+from batch import RoundPack, HitWindows, generate_rounds, hit_windows, ray_circle_hits
+
+class FilteredRounds(NamedTuple):
+    rounds: RoundPack      # accepted rounds
+    window: HitWindows     # their hit windows
+    cost: np.ndarray       # cost of the optimal shot ($)
+    drawn: int             # candidates drawn to get them
+
+    @property
+    def acceptance(self):
+        return len(self.cost) / self.drawn if self.drawn else 0.0
+
+def score_rounds(pack):
+    """Hit windows and optimal-shot costs for a RoundPack."""
+    w = hit_windows(pack.origin_x, pack.target_x, pack.target_y, pack.target_radius)
+    origins = np.stack((pack.origin_x, np.full_like(pack.origin_x, SURFACE_Y_WORLD)), axis=-1)
+    centers = np.stack((pack.target_x, pack.target_y), axis=-1)
+    angles = np.where(w.valid, w.optimal, 0.0)
+    hits = ray_circle_hits(origins, angles, centers, pack.target_radius, outer=False)
+    cost = np.where(w.valid & hits.hit, hits.t_entry * DRILL_COST_PER_METER, np.inf)
+    return w, cost
+
+def band_mask(band, window, cost):
+    keep = window.n_int >= band.min_int_angles
+    if band.max_int_angles is not None:
+        keep &= window.n_int <= band.max_int_angles
+    if band.min_cost is not None:
+        keep &= cost >= band.min_cost
+    if band.max_cost is not None:
+        keep &= cost <= band.max_cost
+    return keep
+
+def _take(tup, idx):
+    return type(tup)(*(a[idx] for a in tup))
+
+def generate_filtered(n, band=DifficultyBand(), seed=None, batch_size=1 << 16, max_drawn=None):
+    """Draw candidates in batches until n rounds in `band` are accepted (or max_drawn
+       candidates have been tried, in which case fewer may be returned)."""
+    rng = np.random.default_rng(seed)
+    parts = []
+    accepted = 0
+    drawn = 0
+    while accepted < n and (max_drawn is None or drawn < max_drawn):
+        ids = rng.integers(0, 2**64, size=batch_size, dtype=np.uint64)
+        pack = generate_rounds(round_ids=ids)
+        w, cost = score_rounds(pack)
+        idx = np.flatnonzero(band_mask(band, w, cost))[:n - accepted]
+        if len(idx):
+            parts.append((_take(pack, idx), _take(w, idx), cost[idx]))
+            accepted += len(idx)
+        # The batch that completes the set only counts up to its last accepted candidate
+        drawn += int(idx[-1]) + 1 if accepted >= n else batch_size
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return FilteredRounds(_take(generate_rounds(round_ids=[]), empty),
+                              _take(hit_windows([], [], [], []), empty), np.empty(0), drawn)
+    rounds = RoundPack(*(np.concatenate(c) for c in zip(*(p[0] for p in parts))))
+    window = HitWindows(*(np.concatenate(c) for c in zip(*(p[1] for p in parts))))
+    return FilteredRounds(rounds, window, np.concatenate([p[2] for p in parts]), drawn)
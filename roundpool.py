@@ -0,0 +1,131 @@
+# roundpool.py
+# Background round prefetcher: a worker thread keeps K generated-and-validated rounds
+# ready so Game.reset_round() pops one in O(1) instead of doing the work on the frame.
+# Pure Python (threading), no pygame.
+
+import random
+import threading
+import time
+from collections import deque
+
+from core import round_from_id, hit_window, SURFACE_Y_WORLD
+
+def validate_reachable(rnd):
+    """Default validator: keep rounds that some angle can actually hit."""
+    return hit_window((rnd.origin_x, SURFACE_Y_WORLD), (rnd.target_x, rnd.target_y),
+                      rnd.target_radius) is not None
+
+class RoundPoolError(RuntimeError):
+    """The validator rejected every ID within max_attempts."""
+
+class RoundPool:
+    """Thread-filled pool of validated rounds.
+
+       `validate(round) -> bool` runs on the worker; rejected rounds are discarded.
+       pop() never blocks: if the pool is empty it generates a round synchronously
+       and counts it in `stats()["empty_pops"]`. If `max_attempts` IDs in a row are
+       rejected, generation raises RoundPoolError (from pop(), for the worker too)."""
+    def __init__(self, size=8, validate=validate_reachable, seed=None, max_attempts=1000):
+        if max_attempts < 1:
+            raise ValueError("RoundPool max_attempts must be at least 1")
+        self.size = size
+        self.validate = validate
+        self.max_attempts = max_attempts
+        self._rng = random.Random(seed)
+        self._rounds = deque()
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+        self._error = None  # RoundPoolError raised on the worker, re-raised by pop()
+        self.generated = 0
+        self.rejected = 0
+        self.empty_pops = 0
+        self.gen_seconds_total = 0.0
+        self.gen_seconds_max = 0.0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="RoundPool", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _generate(self):
+        """Draw IDs until one validates; returns the Round."""
+        t0 = time.perf_counter()
+        rejected = 0
+        for _ in range(self.max_attempts):
+            with self._cond:
+                # The ID stream is shared with synchronous fallbacks, so guard it
+                round_id = self._rng.getrandbits(64)
+            rnd = round_from_id(round_id)
+            if self.validate is None or self.validate(rnd):
+                break
+            rejected += 1
+        else:
+            with self._cond:
+                self.rejected += rejected
+            raise RoundPoolError(f"no valid round in {self.max_attempts} attempts")
+        dt = time.perf_counter() - t0
+        with self._cond:
+            self.generated += 1
+            self.rejected += rejected
+            self.gen_seconds_total += dt
+            self.gen_seconds_max = max(self.gen_seconds_max, dt)
+        return rnd
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stop and len(self._rounds) >= self.size:
+                    self._cond.wait()
+                if self._stop:
+                    return
+            try:
+                rnd = self._generate()
+            except RoundPoolError as e:
+                # Keep the failure for pop() to report instead of dying silently
+                with self._cond:
+                    self._error = e
+                return
+            with self._cond:
+                self._rounds.append(rnd)
+
+    def pop(self):
+        with self._cond:
+            if self._rounds:
+                rnd = self._rounds.popleft()
+                self._cond.notify()
+                return rnd
+            if self._error is not None:
+                raise self._error
+            self.empty_pops += 1
+        return self._generate()
+
+    def depth(self):
+        return len(self._rounds)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "depth": len(self._rounds),
+                "size": self.size,
+                "generated": self.generated,
+                "rejected": self.rejected,
+                "empty_pops": self.empty_pops,
+                "gen_ms_mean": 1000.0 * self.gen_seconds_total / self.generated if self.generated else 0.0,
+                "gen_ms_max": 1000.0 * self.gen_seconds_max,
+            }
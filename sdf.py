@@ -0,0 +1,362 @@
+# sdf.py
+# Signed-distance-field orebodies: circles, boxes and ellipses combined with union,
+# intersection and smooth (polynomial smin) blends into procedural shapes. SdfShape wraps
+# a tree of nodes as a shapes.Shape, so it works in an OrebodyIndex like any other
+# orebody; rays are resolved by sphere tracing to within `epsilon`.
+# Every node's distance is 1-Lipschitz, so a step of distance(p) never skips a surface.
+# Outside the shape it is exact for circles, boxes and hard unions of them (`exact`), a
+# lower bound otherwise. Only exact trees report a closest approach (the "Δ miss"): a
+# separate march along the drilled segment, with the smallest distance seen refined locally.
+# Pure Python scalar path; NumPy is only needed for the *_batch methods.
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # scalar paths still work
+    np = None
+
+from shapes import Shape, _slab
+
+SDF_EPSILON = 1e-3      # m; a ray within this of the surface counts as touching it
+SDF_MAX_STEPS = 512     # sphere-tracing steps per ray before the fallback (see SdfShape.march)
+
+def _rot(x, y, c, s):
+    # Rotate a point by -angle into the primitive's frame
+    return x * c + y * s, -x * s + y * c
+
+# ----------------- Primitives -----------------
+class Circle:
+    exact = True
+
+    def __init__(self, cx, cy, r):
+        self.cx, self.cy, self.r = float(cx), float(cy), float(r)
+
+    def bbox(self):
+        return (self.cx - self.r, self.cx + self.r, self.cy - self.r, self.cy + self.r)
+
+    def distance(self, x, y):
+        return math.hypot(x - self.cx, y - self.cy) - self.r
+
+    def distance_batch(self, x, y):
+        return np.hypot(x - self.cx, y - self.cy) - self.r
+
+class Box:
+    """Rectangle with half-sizes (hw, hh), rotated by `angle` degrees about its centre."""
+    exact = True
+
+    def __init__(self, cx, cy, hw, hh, angle=0.0):
+        self.cx, self.cy, self.hw, self.hh = float(cx), float(cy), float(hw), float(hh)
+        self.angle = float(angle)
+        self._c, self._s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+
+    def bbox(self):
+        ex = abs(self.hw * self._c) + abs(self.hh * self._s)
+        ey = abs(self.hw * self._s) + abs(self.hh * self._c)
+        return (self.cx - ex, self.cx + ex, self.cy - ey, self.cy + ey)
+
+    def distance(self, x, y):
+        u, v = _rot(x - self.cx, y - self.cy, self._c, self._s)
+        qx, qy = abs(u) - self.hw, abs(v) - self.hh
+        return math.hypot(max(qx, 0.0), max(qy, 0.0)) + min(max(qx, qy), 0.0)
+
+    def distance_batch(self, x, y):
+        u, v = _rot(x - self.cx, y - self.cy, self._c, self._s)
+        qx, qy = np.abs(u) - self.hw, np.abs(v) - self.hh
+        return np.hypot(np.maximum(qx, 0.0), np.maximum(qy, 0.0)) + np.minimum(np.maximum(qx, qy), 0.0)
+
+class Ellipse:
+    """Semi-axes (a, b), rotated by `angle` degrees. Distance is the Lipschitz bound
+       (|p / (a, b)| - 1) · min(a, b): exact along the minor axis, never an overestimate."""
+    exact = False
+
+    def __init__(self, cx, cy, a, b, angle=0.0):
+        self.cx, self.cy, self.a, self.b = float(cx), float(cy), float(a), float(b)
+        self.angle = float(angle)
+        self._c, self._s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+
+    def bbox(self):
+        ex = math.hypot(self.a * self._c, self.b * self._s)
+        ey = math.hypot(self.a * self._s, self.b * self._c)
+        return (self.cx - ex, self.cx + ex, self.cy - ey, self.cy + ey)
+
+    def distance(self, x, y):
+        u, v = _rot(x - self.cx, y - self.cy, self._c, self._s)
+        return (math.hypot(u / self.a, v / self.b) - 1.0) * min(self.a, self.b)
+
+    def distance_batch(self, x, y):
+        u, v = _rot(x - self.cx, y - self.cy, self._c, self._s)
+        return (np.hypot(u / self.a, v / self.b) - 1.0) * min(self.a, self.b)
+
+# ----------------- Combinators -----------------
+def _box_union(boxes):
+    return (min(b[0] for b in boxes), max(b[1] for b in boxes),
+            min(b[2] for b in boxes), max(b[3] for b in boxes))
+
+def _box_intersection(boxes):
+    return (max(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), min(b[3] for b in boxes))
+
+class Union:
+    def __init__(self, *nodes):
+        self.nodes = nodes
+        self.exact = all(n.exact for n in nodes)  # min of exact distances is exact outside
+
+    def bbox(self):
+        return _box_union([n.bbox() for n in self.nodes])
+
+    def distance(self, x, y):
+        return min(n.distance(x, y) for n in self.nodes)
+
+    def distance_batch(self, x, y):
+        return np.min([n.distance_batch(x, y) for n in self.nodes], axis=0)
+
+class Intersection:
+    exact = False
+
+    def __init__(self, *nodes):
+        self.nodes = nodes
+
+    def bbox(self):
+        return _box_intersection([n.bbox() for n in self.nodes])
+
+    def distance(self, x, y):
+        return max(n.distance(x, y) for n in self.nodes)
+
+    def distance_batch(self, x, y):
+        return np.max([n.distance_batch(x, y) for n in self.nodes], axis=0)
+
+class Difference:
+    """`a` with `b` cut out of it."""
+    exact = False
+
+    def __init__(self, a, b):
+        self.a, self.b = a, b
+
+    def bbox(self):
+        return self.a.bbox()
+
+    def distance(self, x, y):
+        return max(self.a.distance(x, y), -self.b.distance(x, y))
+
+    def distance_batch(self, x, y):
+        return np.maximum(self.a.distance_batch(x, y), -self.b.distance_batch(x, y))
+
+class SmoothUnion:
+    """Union of a and b with a rounded fillet of width ~k (m) where they meet."""
+    exact = False
+
+    def __init__(self, a, b, k):
+        self.a, self.b, self.k = a, b, float(k)
+
+    def bbox(self):
+        # The blend grows the union by at most k/4
+        x0, x1, y0, y1 = _box_union([self.a.bbox(), self.b.bbox()])
+        g = self.k / 4.0
+        return (x0 - g, x1 + g, y0 - g, y1 + g)
+
+    def distance(self, x, y):
+        da, db = self.a.distance(x, y), self.b.distance(x, y)
+        h = max(self.k - abs(da - db), 0.0) / self.k
+        return min(da, db) - h * h * self.k / 4.0
+
+    def distance_batch(self, x, y):
+        da, db = self.a.distance_batch(x, y), self.b.distance_batch(x, y)
+        h = np.maximum(self.k - np.abs(da - db), 0.0) / self.k
+        return np.minimum(da, db) - h * h * self.k / 4.0
+
+class SmoothIntersection:
+    """Intersection of a and b with the crease rounded off over ~k (m)."""
+    exact = False
+
+    def __init__(self, a, b, k):
+        self.a, self.b, self.k = a, b, float(k)
+
+    def bbox(self):
+        return _box_intersection([self.a.bbox(), self.b.bbox()])
+
+    def distance(self, x, y):
+        da, db = self.a.distance(x, y), self.b.distance(x, y)
+        h = max(self.k - abs(da - db), 0.0) / self.k
+        return max(da, db) + h * h * self.k / 4.0
+
+    def distance_batch(self, x, y):
+        da, db = self.a.distance_batch(x, y), self.b.distance_batch(x, y)
+        h = np.maximum(self.k - np.abs(da - db), 0.0) / self.k
+        return np.maximum(da, db) + h * h * self.k / 4.0
+
+# ----------------- Shape adapter -----------------
+class SdfShape(Shape):
+    """An SDF node tree as an orebody, resolved by sphere tracing."""
+    def __init__(self, node, epsilon=SDF_EPSILON, max_steps=SDF_MAX_STEPS):
+        self.node = node
+        self.epsilon = float(epsilon)
+        self.max_steps = max_steps
+        self._bbox = node.bbox()
+
+    def bbox(self):
+        return self._bbox
+
+    def signed_distance(self, p):
+        return self.node.distance(p[0], p[1])
+
+    def signed_distance_batch(self, points):
+        p = np.asarray(points, dtype=np.float64)
+        return self.node.distance_batch(p[..., 0], p[..., 1])
+
+    def _box_exit(self, p0, d):
+        # Where p0 + t*d leaves the bounding box; nothing is hit beyond it
+        t = math.inf
+        for p, v, lo, hi in ((p0[0], d[0], self._bbox[0], self._bbox[1]),
+                             (p0[1], d[1], self._bbox[2], self._bbox[3])):
+            if v != 0.0:
+                t = min(t, max((lo - p) / v, (hi - p) / v))
+        return t
+
+    def _bisect(self, p0, d, lo, hi, inside):
+        # Narrow [lo, hi] around a surface crossing to within epsilon; `inside(dist)`
+        # holds at hi and not at lo. Returns hi.
+        dist_fn = self.node.distance
+        while hi - lo > self.epsilon:
+            m = (lo + hi) / 2.0
+            if inside(dist_fn(p0[0] + d[0] * m, p0[1] + d[1] * m)):
+                hi = m
+            else:
+                lo = m
+        return hi
+
+    def march(self, p0, d, t_max, t=0.0):
+        """Sphere trace p0 + t*d from t to t_max. Returns (t_hit or None, smallest
+           distance seen, where it was seen).
+
+           A ray running nearly parallel to a surface creeps towards it in ever smaller
+           steps; if max_steps runs out first, the rest of the span is covered in at most
+           max_steps more steps of at least span / max_steps, bisecting back when one
+           lands inside. Only features thinner than that step can then be missed."""
+        best, best_t = math.inf, t
+        dist_fn = self.node.distance
+        floor, steps, prev = 0.0, 0, t
+        while t <= t_max:
+            dist = dist_fn(p0[0] + d[0] * t, p0[1] + d[1] * t)
+            if dist < best:
+                best, best_t = dist, t
+            if dist < self.epsilon:
+                if floor and t > prev:
+                    t = self._bisect(p0, d, prev, t, lambda v: v < self.epsilon)
+                return t, best, best_t
+            steps += 1
+            if steps == self.max_steps:
+                floor = (min(t_max, self._box_exit(p0, d)) - t) / self.max_steps
+                if floor <= 0.0:
+                    break   # already past the shape
+            prev = t
+            t += max(dist, floor)
+        return None, best, best_t
+
+    def _exit(self, p0, d, t):
+        """(t_out, entered): where the ray leaves the shape after a hit at t, and whether
+           it went inside at all (a ray that only grazes exits at once). Same budget and
+           fallback as march()."""
+        # The hit point is up to epsilon outside: nudge in, then march on -distance
+        # until the surface is crossed again
+        dist_fn = self.node.distance
+        inside = False
+        floor, steps, prev = 0.0, 0, t
+        while True:
+            dist = dist_fn(p0[0] + d[0] * t, p0[1] + d[1] * t)
+            if dist < 0.0:
+                inside, prev = True, t
+                t += max(-dist, self.epsilon, floor)
+            elif inside:
+                if floor:
+                    t = self._bisect(p0, d, prev, t, lambda v: v >= 0.0)
+                return t, True
+            elif dist >= self.epsilon:
+                return t, False
+            else:
+                t += max(self.epsilon, floor)
+            steps += 1
+            if steps == self.max_steps:
+                floor = max(self._box_exit(p0, d) - t, 0.0) / self.max_steps
+
+    def ray_interval(self, p0, d, t_max=math.inf):
+        if not _slab(p0, d, self._bbox, t_max):
+            return None
+        if not math.isfinite(t_max):
+            x0, x1, y0, y1 = self._bbox
+            t_max = math.hypot(p0[0] - (x0 + x1) / 2, p0[1] - (y0 + y1) / 2) + math.hypot(x1 - x0, y1 - y0)
+        t_hit, _, _ = self.march(p0, d, t_max)
+        if t_hit is None:
+            return None
+        return (t_hit, self._exit(p0, d, t_hit)[0])
+
+    def intervals(self, p0, d):
+        # Trace the whole line from a start point behind the shape
+        x0, x1, y0, y1 = self._bbox
+        back = math.hypot(p0[0] - (x0 + x1) / 2, p0[1] - (y0 + y1) / 2) + math.hypot(x1 - x0, y1 - y0)
+        start = (p0[0] - d[0] * back, p0[1] - d[1] * back)
+        out = []
+        t = 0.0
+        while True:
+            t_hit, _, _ = self.march(start, d, 2.0 * back, t)
+            if t_hit is None:
+                return out
+            t, entered = self._exit(start, d, t_hit)
+            # Leaving at a shallow angle, the ray stays within epsilon of the surface for
+            # a while and "touches" it again at once: that is the same crossing
+            if entered or not out or t_hit - back > out[-1][1] + 2.0 * self.epsilon:
+                out.append((t_hit - back, t - back))
+            t += self.epsilon
+
+    def _interval_batch(self, o, d):
+        # All rays marched together; finished rays stop moving
+        t = np.zeros(len(o))
+        t_in = np.full(len(o), np.inf)
+        live = np.ones(len(o), dtype=bool)
+        x0, x1, y0, y1 = self._bbox
+        reach = np.hypot(o[:, 0] - (x0 + x1) / 2, o[:, 1] - (y0 + y1) / 2) + math.hypot(x1 - x0, y1 - y0)
+        for _ in range(self.max_steps):
+            if not live.any():
+                break
+            p = o[live] + d[live] * t[live, None]
+            dist = self.node.distance_batch(p[:, 0], p[:, 1])
+            idx = np.flatnonzero(live)
+            hit = dist < self.epsilon
+            t_in[idx[hit]] = t[idx[hit]]
+            t[idx] += np.where(hit, 0.0, dist)
+            live[idx[hit]] = False
+            live &= t <= reach
+        # Rays still going when the budget ran out finish with march()'s fallback
+        for k in np.flatnonzero(live):
+            t_hit, _, _ = self.march(o[k], d[k], reach[k], t[k])
+            if t_hit is not None:
+                t_in[k] = t_hit
+        t_out = np.full(len(o), -np.inf)
+        for k in np.flatnonzero(np.isfinite(t_in)):
+            t_out[k] = self._exit(o[k], d[k], t_in[k])[0]
+        return t_in, t_out
+
+    def closest_approach(self, p0, d, t_max):
+        """Marches the segment again (resolving the hole only looks for a hit). None
+           unless the tree is exact: a lower bound would understate the miss."""
+        if not self.node.exact:
+            return None
+        t_hit, best, t = self.march(p0, d, t_max)
+        if t_hit is not None:
+            return 0.0
+        # Samples are a step (= best) apart near the minimum; refine between neighbours
+        dist_fn = self.node.distance
+        lo, hi = max(0.0, t - best), min(t_max, t + best)
+        for _ in range(40):
+            m1, m2 = lo + (hi - lo) / 3.0, hi - (hi - lo) / 3.0
+            if dist_fn(p0[0] + d[0] * m1, p0[1] + d[1] * m1) < dist_fn(p0[0] + d[0] * m2, p0[1] + d[1] * m2):
+                hi = m2
+            else:
+                lo = m1
+        m = (lo + hi) / 2.0
+        return max(min(best, dist_fn(p0[0] + d[0] * m, p0[1] + d[1] * m)), 0.0)
+
+    def outline(self, n=64):
+        """Box around the shape (the renderer rasterizes the field itself)."""
+        x0, x1, y0, y1 = self._bbox
+        return [(x0, y0), (x1, y0), (x1, y1), (x0, y1)]
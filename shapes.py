@@ -0,0 +1,427 @@
+# shapes.py
+# Pluggable orebody shapes. Every shape implements the Shape protocol below with both a
+# scalar path (pure Python, used per frame by Game/OrebodyIndex) and a NumPy batch path
+# (used by the bulk tools); both run a bounding-box slab prefilter before the exact test.
+# Built-ins: Circle, Ellipse (rotated), Polygon (convex or concave), Capsule, Lens.
+# Rays are p0 + t*d with unit d, in world coords; distances t are in metres.
+# NumPy is only needed for the *_batch methods.
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # scalar paths still work
+    np = None
+
+_NO_INTERVAL = (math.inf, -math.inf)
+
+def _slab(p0, d, bbox, t_max=math.inf):
+    """Does the ray (0 <= t <= t_max) touch the box (x_min, x_max, y_min, y_max)?"""
+    t0, t1 = 0.0, t_max
+    for p, v, lo, hi in ((p0[0], d[0], bbox[0], bbox[1]), (p0[1], d[1], bbox[2], bbox[3])):
+        if v == 0.0:
+            if p < lo or p > hi:
+                return False
+        else:
+            a, b = (lo - p) / v, (hi - p) / v
+            if a > b:
+                a, b = b, a
+            t0, t1 = max(t0, a), min(t1, b)
+            if t0 > t1:
+                return False
+    return True
+
+def _slab_batch(o, d, bbox, t_max):
+    x_min, x_max, y_min, y_max = bbox
+    lo = np.array((x_min, y_min))
+    hi = np.array((x_max, y_max))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (lo - o) / d
+        b = (hi - o) / d
+    near = np.where(d != 0.0, np.minimum(a, b), np.where((o >= lo) & (o <= hi), -np.inf, np.inf))
+    far = np.where(d != 0.0, np.maximum(a, b), np.where((o >= lo) & (o <= hi), np.inf, -np.inf))
+    t0 = np.maximum(near.max(axis=-1), 0.0)
+    t1 = np.minimum(far.min(axis=-1), t_max)
+    return t0 <= t1
+
+def _quad_interval(fx, fy, dx, dy, r2=1.0):
+    """Full-line interval of p + t*d inside the circle |p| <= sqrt(r2); d need not be unit."""
+    a = dx*dx + dy*dy
+    b = fx*dx + fy*dy
+    c = fx*fx + fy*fy - r2
+    disc = b*b - a*c
+    if disc < 0.0 or a == 0.0:
+        return _NO_INTERVAL
+    s = math.sqrt(disc)
+    return ((-b - s) / a, (-b + s) / a)
+
+def _quad_interval_batch(fx, fy, dx, dy, r2=1.0):
+    a = dx*dx + dy*dy
+    b = fx*dx + fy*dy
+    c = fx*fx + fy*fy - r2
+    disc = b*b - a*c
+    ok = (disc >= 0.0) & (a > 0.0)
+    s = np.sqrt(np.where(ok, disc, 0.0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_in = np.where(ok, (-b - s) / a, np.inf)
+        t_out = np.where(ok, (-b + s) / a, -np.inf)
+    return t_in, t_out
+
+class Shape:
+    """Orebody shape protocol.
+
+       Subclasses provide bbox(), intervals() and signed_distance() for single rays and
+       points, plus _interval_batch() and signed_distance_batch() for NumPy arrays. The
+       base class adds the bounding-box prefilter and the drill semantics: the drill
+       enters at the first interval ahead of the collar (t clipped to >= 0)."""
+
+    def bbox(self):
+        """(x_min, x_max, y_min, y_max)."""
+        raise NotImplementedError
+
+    def intervals(self, p0, d):
+        """Sorted full-line (t_in, t_out) intervals where the line is inside the shape."""
+        raise NotImplementedError
+
+    def signed_distance(self, p):
+        """Negative inside, positive outside (metres)."""
+        raise NotImplementedError
+
+    def _interval_batch(self, o, d):
+        """(t_in, t_out) arrays of the first full-line interval with t_out >= 0
+           (t_in = inf, t_out = -inf where there is none)."""
+        raise NotImplementedError
+
+    def signed_distance_batch(self, points):
+        raise NotImplementedError
+
+    def outline(self, n=64):
+        """Boundary polyline for drawing."""
+        raise NotImplementedError
+
+    def ray_interval(self, p0, d, t_max=math.inf):
+        """(entry, exit) distances of the first crossing the drill makes within t_max,
+           entry clipped to >= 0; None on a miss."""
+        if not _slab(p0, d, self.bbox(), t_max):
+            return None
+        for t_in, t_out in self.intervals(p0, d):
+            if t_out >= 0.0:
+                t_in = max(t_in, 0.0)
+                return (t_in, t_out) if t_in <= t_max else None
+        return None
+
+    def contains(self, p):
+        return self.signed_distance(p) <= 0.0
+
+    def closest_approach(self, p0, d, t_max):
+        """Smallest distance from the segment p0 + t*d (0 <= t <= t_max) to the shape,
+           for the "Δ miss" readout; None if the shape doesn't provide one."""
+        return None
+
+    def prepare(self):
+        """Build any cached acceleration data now rather than on first use mid-frame
+           (Game.set_orebodies calls it when a round's orebodies are loaded)."""
+
+    def ray_interval_batch(self, origins, dirs, t_max=np.inf if np else math.inf):
+        """Batched ray_interval: (hit, t_in, t_out) arrays for rays (N, 2)/(N, 2)."""
+        o = np.asarray(origins, dtype=np.float64)
+        d = np.asarray(dirs, dtype=np.float64)
+        o, d = np.broadcast_arrays(o, d)
+        t_max = np.broadcast_to(np.asarray(t_max, dtype=np.float64), o.shape[:-1])
+        t_in = np.full(o.shape[:-1], np.inf)
+        t_out = np.full(o.shape[:-1], -np.inf)
+        cand = _slab_batch(o, d, self.bbox(), t_max)
+        if cand.any():
+            a, b = self._interval_batch(o[cand], d[cand])
+            t_in[cand], t_out[cand] = np.maximum(a, 0.0), b
+        hit = (t_out >= 0.0) & (t_in <= t_max)
+        return hit, np.where(hit, t_in, np.inf), np.where(hit, t_out, -np.inf)
+
+def _first_ahead_batch(t_in, t_out):
+    miss = t_out < 0.0
+    return np.where(miss, np.inf, t_in), np.where(miss, -np.inf, t_out)
+
+# ----------------- Circle -----------------
+class Circle(Shape):
+    def __init__(self, cx, cy, r):
+        self.cx, self.cy, self.r = float(cx), float(cy), float(r)
+
+    def bbox(self):
+        return (self.cx - self.r, self.cx + self.r, self.cy - self.r, self.cy + self.r)
+
+    def intervals(self, p0, d):
+        iv = _quad_interval(p0[0] - self.cx, p0[1] - self.cy, d[0], d[1], self.r * self.r)
+        return [iv] if iv[0] <= iv[1] else []
+
+    def signed_distance(self, p):
+        return math.hypot(p[0] - self.cx, p[1] - self.cy) - self.r
+
+    def _interval_batch(self, o, d):
+        return _first_ahead_batch(*_quad_interval_batch(o[:, 0] - self.cx, o[:, 1] - self.cy,
+                                                        d[:, 0], d[:, 1], self.r * self.r))
+
+    def signed_distance_batch(self, points):
+        p = np.asarray(points, dtype=np.float64)
+        return np.hypot(p[..., 0] - self.cx, p[..., 1] - self.cy) - self.r
+
+    def closest_approach(self, p0, d, t_max):
+        # Nearest point of the segment to the centre, clamped to its ends
+        t = min(max((self.cx - p0[0]) * d[0] + (self.cy - p0[1]) * d[1], 0.0), t_max)
+        return max(math.hypot(p0[0] + d[0] * t - self.cx, p0[1] + d[1] * t - self.cy) - self.r, 0.0)
+
+    def outline(self, n=64):
+        return [(self.cx + self.r * math.cos(2*math.pi*k/n), self.cy + self.r * math.sin(2*math.pi*k/n))
+                for k in range(n)]
+
+# ----------------- Ellipse -----------------
+class Ellipse(Shape):
+    """Semi-axes a (along the rotated x axis) and b, rotated by `angle` degrees."""
+    def __init__(self, cx, cy, a, b, angle=0.0):
+        self.cx, self.cy, self.a, self.b = float(cx), float(cy), float(a), float(b)
+        self.angle = float(angle)
+        self._c = math.cos(math.radians(angle))
+        self._s = math.sin(math.radians(angle))
+
+    def _local(self, x, y):
+        """World offset -> ellipse frame (unscaled)."""
+        return x * self._c + y * self._s, -x * self._s + y * self._c
+
+    def bbox(self):
+        hw = math.hypot(self.a * self._c, self.b * self._s)
+        hh = math.hypot(self.a * self._s, self.b * self._c)
+        return (self.cx - hw, self.cx + hw, self.cy - hh, self.cy + hh)
+
+    def intervals(self, p0, d):
+        # Map to the unit circle; the map is linear, so t is unchanged
+        fx, fy = self._local(p0[0] - self.cx, p0[1] - self.cy)
+        dx, dy = self._local(d[0], d[1])
+        iv = _quad_interval(fx / self.a, fy / self.b, dx / self.a, dy / self.b)
+        return [iv] if iv[0] <= iv[1] else []
+
+    def signed_distance(self, p):
+        # Approximate (exact on the axes and close to the boundary): k0 (k0 - 1) / k1
+        x, y = self._local(p[0] - self.cx, p[1] - self.cy)
+        k0 = math.hypot(x / self.a, y / self.b)
+        k1 = math.hypot(x / (self.a * self.a), y / (self.b * self.b))
+        if k1 == 0.0:
+            return -min(self.a, self.b)
+        return k0 * (k0 - 1.0) / k1
+
+    def _interval_batch(self, o, d):
+        fx, fy = self._local(o[:, 0] - self.cx, o[:, 1] - self.cy)
+        dx, dy = self._local(d[:, 0], d[:, 1])
+        return _first_ahead_batch(*_quad_interval_batch(fx / self.a, fy / self.b, dx / self.a, dy / self.b))
+
+    def signed_distance_batch(self, points):
+        p = np.asarray(points, dtype=np.float64)
+        x, y = self._local(p[..., 0] - self.cx, p[..., 1] - self.cy)
+        k0 = np.hypot(x / self.a, y / self.b)
+        k1 = np.hypot(x / (self.a * self.a), y / (self.b * self.b))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(k1 == 0.0, -min(self.a, self.b), k0 * (k0 - 1.0) / k1)
+
+    def outline(self, n=64):
+        pts = []
+        for k in range(n):
+            u = 2 * math.pi * k / n
+            x, y = self.a * math.cos(u), self.b * math.sin(u)
+            pts.append((self.cx + x * self._c - y * self._s, self.cy + x * self._s + y * self._c))
+        return pts
+
+# ----------------- Polygon -----------------
+class Polygon(Shape):
+    """Simple polygon, convex or concave, from a list of (x, y) vertices in either winding."""
+    def __init__(self, vertices):
+        self.vertices = [(float(x), float(y)) for x, y in vertices]
+        if len(self.vertices) < 3:
+            raise ValueError("Polygon needs at least 3 vertices")
+        self._edges = [(self.vertices[i], self.vertices[(i + 1) % len(self.vertices)])
+                       for i in range(len(self.vertices))]
+        if np is not None:
+            v = np.array(self.vertices)
+            self._va = v
+            self._ve = np.roll(v, -1, axis=0) - v
+
+    def bbox(self):
+        xs = [x for x, _ in self.vertices]
+        ys = [y for _, y in self.vertices]
+        return (min(xs), max(xs), min(ys), max(ys))
+
+    def crossings(self, p0, d):
+        """Sorted t where the line p0 + t*d crosses an edge."""
+        ts = []
+        for (ax, ay), (bx, by) in self._edges:
+            ex, ey = bx - ax, by - ay
+            denom = d[0]*ey - d[1]*ex
+            if denom == 0.0:
+                continue
+            wx, wy = ax - p0[0], ay - p0[1]
+            s = (wx*d[1] - wy*d[0]) / denom
+            if 0.0 <= s < 1.0:  # half-open so a shared vertex counts once
+                ts.append((wx*ey - wy*ex) / denom)
+        ts.sort()
+        return ts
+
+    def intervals(self, p0, d):
+        ts = self.crossings(p0, d)
+        # The line starts outside at t = -inf, so crossings pair up in order
+        return [(ts[k], ts[k + 1]) for k in range(0, len(ts) - 1, 2)]
+
+    def signed_distance(self, p):
+        px, py = p
+        best = math.inf
+        inside = False
+        for (ax, ay), (bx, by) in self._edges:
+            ex, ey = bx - ax, by - ay
+            wx, wy = px - ax, py - ay
+            h = max(0.0, min(1.0, (wx*ex + wy*ey) / (ex*ex + ey*ey)))
+            best = min(best, math.hypot(wx - ex*h, wy - ey*h))
+            if (ay > py) != (by > py) and px < ax + (py - ay) * ex / ey:
+                inside = not inside
+        return -best if inside else best
+
+    def _crossings_batch(self, o, d):
+        """(N, E) crossing t per edge, sorted, inf where an edge isn't crossed."""
+        a, e = self._va, self._ve
+        denom = d[:, None, 0] * e[None, :, 1] - d[:, None, 1] * e[None, :, 0]
+        wx = a[None, :, 0] - o[:, None, 0]
+        wy = a[None, :, 1] - o[:, None, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = (wx * d[:, None, 1] - wy * d[:, None, 0]) / denom
+            t = (wx * e[None, :, 1] - wy * e[None, :, 0]) / denom
+        ok = (denom != 0.0) & (s >= 0.0) & (s < 1.0)
+        return np.sort(np.where(ok, t, np.inf), axis=1)
+
+    def _interval_batch(self, o, d):
+        ts = self._crossings_batch(o, d)
+        n = ts.shape[1]
+        behind = (ts < 0.0).sum(axis=1)          # crossings before the collar
+        crossed = np.isfinite(ts).sum(axis=1)
+        inside = behind % 2 == 1
+        # Inside: the pair straddling t = 0; outside: the next pair ahead
+        k_in = np.where(inside, behind - 1, behind)
+        ok = k_in + 1 < crossed
+        rows = np.arange(len(ts))
+        t_in = ts[rows, np.clip(k_in, 0, n - 1)]
+        t_out = ts[rows, np.clip(k_in + 1, 0, n - 1)]
+        return _first_ahead_batch(np.where(ok, t_in, np.inf), np.where(ok, t_out, -np.inf))
+
+    def signed_distance_batch(self, points):
+        p = np.asarray(points, dtype=np.float64)
+        flat = p.reshape(-1, 2)
+        a, e = self._va, self._ve
+        w = flat[:, None, :] - a[None, :, :]
+        h = np.clip((w * e).sum(-1) / (e * e).sum(-1), 0.0, 1.0)
+        dist = np.hypot(w[..., 0] - e[:, 0] * h, w[..., 1] - e[:, 1] * h).min(axis=1)
+        ay, by = a[:, 1], a[:, 1] + e[:, 1]
+        py = flat[:, None, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cross = ((ay > py) != (by > py)) & (flat[:, None, 0] < a[:, 0] + (py - ay) * e[:, 0] / e[:, 1])
+        inside = cross.sum(axis=1) % 2 == 1
+        return np.where(inside, -dist, dist).reshape(p.shape[:-1])
+
+    def outline(self, n=64):
+        return list(self.vertices)
+
+# ----------------- Capsule -----------------
+class Capsule(Shape):
+    """All points within r of the segment (ax, ay)-(bx, by)."""
+    def __init__(self, ax, ay, bx, by, r):
+        self.ax, self.ay, self.bx, self.by, self.r = map(float, (ax, ay, bx, by, r))
+        self._ends = (Circle(ax, ay, r), Circle(bx, by, r))
+        ux, uy = bx - ax, by - ay
+        length = math.hypot(ux, uy)
+        nx, ny = (-uy / length * r, ux / length * r) if length else (0.0, r)
+        self._body = Polygon([(ax + nx, ay + ny), (bx + nx, by + ny), (bx - nx, by - ny), (ax - nx, ay - ny)]) if length else None
+
+    def _parts(self):
+        return self._ends + ((self._body,) if self._body else ())
+
+    def bbox(self):
+        return (min(self.ax, self.bx) - self.r, max(self.ax, self.bx) + self.r,
+                min(self.ay, self.by) - self.r, max(self.ay, self.by) + self.r)
+
+    def intervals(self, p0, d):
+        # Convex union of convex parts: one interval spanning all part intervals
+        ivs = [iv for part in self._parts() for iv in part.intervals(p0, d)]
+        if not ivs:
+            return []
+        return [(min(i for i, _ in ivs), max(o for _, o in ivs))]
+
+    def signed_distance(self, p):
+        ux, uy = self.bx - self.ax, self.by - self.ay
+        wx, wy = p[0] - self.ax, p[1] - self.ay
+        l2 = ux*ux + uy*uy
+        h = max(0.0, min(1.0, (wx*ux + wy*uy) / l2)) if l2 else 0.0
+        return math.hypot(wx - ux*h, wy - uy*h) - self.r
+
+    def _full_batch(self, part, o, d):
+        if isinstance(part, Circle):
+            return _quad_interval_batch(o[:, 0] - part.cx, o[:, 1] - part.cy, d[:, 0], d[:, 1], part.r * part.r)
+        ts = part._crossings_batch(o, d)
+        ok = np.isfinite(ts[:, 1])
+        return np.where(ok, ts[:, 0], np.inf), np.where(ok, ts[:, 1], -np.inf)
+
+    def _interval_batch(self, o, d):
+        t_in, t_out = np.full(len(o), np.inf), np.full(len(o), -np.inf)
+        for part in self._parts():
+            a, b = self._full_batch(part, o, d)
+            t_in, t_out = np.minimum(t_in, a), np.maximum(t_out, b)
+        return _first_ahead_batch(t_in, t_out)
+
+    def signed_distance_batch(self, points):
+        p = np.asarray(points, dtype=np.float64)
+        ux, uy = self.bx - self.ax, self.by - self.ay
+        wx, wy = p[..., 0] - self.ax, p[..., 1] - self.ay
+        l2 = ux*ux + uy*uy
+        h = np.clip((wx*ux + wy*uy) / l2, 0.0, 1.0) if l2 else 0.0
+        return np.hypot(wx - ux*h, wy - uy*h) - self.r
+
+    def outline(self, n=64):
+        ang = math.atan2(self.by - self.ay, self.bx - self.ax)
+        half = max(2, n // 2)
+        pts = [(self.bx + self.r * math.cos(ang - math.pi/2 + math.pi*k/(half - 1)),
+                self.by + self.r * math.sin(ang - math.pi/2 + math.pi*k/(half - 1))) for k in range(half)]
+        pts += [(self.ax + self.r * math.cos(ang + math.pi/2 + math.pi*k/(half - 1)),
+                 self.ay + self.r * math.sin(ang + math.pi/2 + math.pi*k/(half - 1))) for k in range(half)]
+        return pts
+
+# ----------------- Lens -----------------
+class Lens(Shape):
+    """Intersection of two circles."""
+    def __init__(self, c1, r1, c2, r2):
+        self.a = Circle(c1[0], c1[1], r1)
+        self.b = Circle(c2[0], c2[1], r2)
+
+    def bbox(self):
+        a, b = self.a.bbox(), self.b.bbox()
+        return (max(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), min(a[3], b[3]))
+
+    def intervals(self, p0, d):
+        ia, ib = self.a.intervals(p0, d), self.b.intervals(p0, d)
+        if not ia or not ib:
+            return []
+        t_in, t_out = max(ia[0][0], ib[0][0]), min(ia[0][1], ib[0][1])
+        return [(t_in, t_out)] if t_in <= t_out else []
+
+    def signed_distance(self, p):
+        # Exact inside; a lower bound outside near the tips
+        return max(self.a.signed_distance(p), self.b.signed_distance(p))
+
+    def _interval_batch(self, o, d):
+        a_in, a_out = _quad_interval_batch(o[:, 0] - self.a.cx, o[:, 1] - self.a.cy, d[:, 0], d[:, 1], self.a.r ** 2)
+        b_in, b_out = _quad_interval_batch(o[:, 0] - self.b.cx, o[:, 1] - self.b.cy, d[:, 0], d[:, 1], self.b.r ** 2)
+        t_in, t_out = np.maximum(a_in, b_in), np.minimum(a_out, b_out)
+        empty = t_in > t_out
+        return _first_ahead_batch(np.where(empty, np.inf, t_in), np.where(empty, -np.inf, t_out))
+
+    def signed_distance_batch(self, points):
+        return np.maximum(self.a.signed_distance_batch(points), self.b.signed_distance_batch(points))
+
+    def outline(self, n=64):
+        pts = [p for p in self.a.outline(n) if self.b.signed_distance(p) <= 1e-9]
+        pts += [p for p in self.b.outline(n) if self.a.signed_distance(p) <= 1e-9]
+        cx = sum(x for x, _ in pts) / len(pts) if pts else self.a.cx
+        cy = sum(y for _, y in pts) / len(pts) if pts else self.a.cy
+        pts.sort(key=lambda q: math.atan2(q[1] - cy, q[0] - cx))
+        return pts
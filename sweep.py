@@ -0,0 +1,131 @@
+# sweep.py
+# Config-space balancing sweeps. Each config point overrides some of the tuning constants
+# in CONFIG_KEYS and is scored by simulating rounds under a reference aiming-error model:
+# expected win rate, mean cost and budget-overrun rate. Points run in parallel on a
+# process pool, are cached on disk by a hash of everything that affects the result,
+# and are written to a CSV table for plotting. Requires numpy.
+
+import csv
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import core
+from core import SURFACE_Y_WORLD, ANGLE_MIN, ANGLE_MAX
+from batch import generate_rounds, ray_circle_hits, ray_directions, world_exit_distances
+from montecarlo import ErrorModel
+
+CONFIG_KEYS = (
+    "TARGET_RADIUS_MIN", "TARGET_RADIUS_MAX",
+    "TARGET_Y_MIN", "TARGET_Y_MAX",
+    "DRILL_COST_PER_METER", "DRILL_COST_BUDGET",
+)
+METRIC_KEYS = ("win_rate", "win_rate_first_try", "mean_cost", "overrun_rate", "mean_attempts")
+
+REFERENCE_MODEL = ErrorModel(aim_sigma_deg=1.0, collar_sigma_m=0.0, deviation_sigma_deg=0.25)
+CACHE_VERSION = 1  # bump when evaluate() changes meaning
+
+def default_config():
+    return {k: float(getattr(core, k)) for k in CONFIG_KEYS}
+
+def grid(**axes):
+    """Cartesian product of per-key value lists; unspecified keys keep their defaults."""
+    keys = list(axes)
+    return [dict(default_config(), **{k: float(v) for k, v in zip(keys, vals)})
+            for vals in itertools.product(*(axes[k] for k in keys))]
+
+def latin_hypercube(n, seed=None, **ranges):
+    """n config points, one per stratum of every (low, high) range."""
+    rng = np.random.default_rng(seed)
+    cols = {}
+    for key, (lo, hi) in ranges.items():
+        u = (rng.permutation(n) + rng.random(n)) / n
+        cols[key] = lo + (hi - lo) * u
+    return [dict(default_config(), **{k: float(v[i]) for k, v in cols.items()}) for i in range(n)]
+
+def evaluate(config, model=REFERENCE_MODEL, rounds=100_000, tries=3, seed=0):
+    """Simulate `rounds` rounds of config. The reference player aims at the target centre
+       with Gaussian error, rounds to a whole degree on the handle and re-aims
+       independently on each try until a hit or tries run out."""
+    params = (
+        ("origin_x", core.ORIGIN_X_MIN, core.ORIGIN_X_MAX),
+        ("target_x", core.TARGET_X_MIN, core.TARGET_X_MAX),
+        ("target_y", config["TARGET_Y_MIN"], config["TARGET_Y_MAX"]),
+        ("target_radius", config["TARGET_RADIUS_MIN"], config["TARGET_RADIUS_MAX"]),
+    )
+    pack = generate_rounds(rounds, seed=seed, params=params)
+    rng = np.random.default_rng(seed + 1)
+    centers = np.stack((pack.target_x, pack.target_y), axis=-1)
+    center_angle = np.degrees(np.arctan2(pack.target_y - SURFACE_Y_WORLD, pack.target_x - pack.origin_x))
+
+    won = np.zeros(rounds, dtype=bool)
+    won_first = None
+    attempts = np.zeros(rounds, dtype=np.int64)
+    path = np.zeros(rounds)
+    for _ in range(tries):
+        active = ~won
+        handle = np.clip(np.rint(center_angle + rng.normal(0.0, model.aim_sigma_deg, rounds)),
+                         ANGLE_MIN, ANGLE_MAX)
+        angles = handle + rng.normal(0.0, model.deviation_sigma_deg, rounds) if model.deviation_sigma_deg else handle
+        origins = np.stack((pack.origin_x + (rng.normal(0.0, model.collar_sigma_m, rounds)
+                                             if model.collar_sigma_m else 0.0),
+                            np.full(rounds, SURFACE_Y_WORLD)), axis=-1)
+        hits = ray_circle_hits(origins, angles, centers, pack.target_radius, outer=False)
+        miss_len = world_exit_distances(origins, ray_directions(angles))
+        path += np.where(active, np.where(hits.hit, hits.t_entry, miss_len), 0.0)
+        attempts += active
+        won |= active & hits.hit
+        if won_first is None:
+            won_first = won.copy()
+    cost = path * config["DRILL_COST_PER_METER"]
+    return {
+        "win_rate": float(won.mean()),
+        "win_rate_first_try": float(won_first.mean()),
+        "mean_cost": float(cost.mean()),
+        "overrun_rate": float((cost > config["DRILL_COST_BUDGET"]).mean()),
+        "mean_attempts": float(attempts.mean()),
+    }
+
+def cache_key(config, model, rounds, tries, seed):
+    blob = json.dumps({"v": CACHE_VERSION, "config": config, "model": model.__dict__,
+                       "rounds": rounds, "tries": tries, "seed": seed}, sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+def _evaluate_cached(config, model, rounds, tries, seed, cache_dir):
+    path = os.path.join(cache_dir, cache_key(config, model, rounds, tries, seed) + ".json") if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f), True
+    metrics = evaluate(config, model, rounds, tries, seed)
+    if path:
+        # A temp file per writer: workers evaluating the same point must not share one
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+        with os.fdopen(fd, "w") as f:
+            json.dump(metrics, f)
+        os.replace(tmp, path)  # atomic, so parallel sweeps never see half a file
+    return metrics, False
+
+def run_sweep(configs, out_csv=None, cache_dir=".sweep_cache", model=REFERENCE_MODEL,
+              rounds=100_000, tries=3, seed=0, workers=None):
+    """Evaluate every config point (in parallel, reusing cached points) and return rows
+       of config + metrics; also written to out_csv if given. workers=0 runs in-process."""
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    args = [(c, model, rounds, tries, seed, cache_dir) for c in configs]
+    if workers == 0:
+        results = [_evaluate_cached(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as ex:
+            results = list(ex.map(_evaluate_cached, *zip(*args))) if args else []
+    rows = [dict(c, **m, cached=hit) for c, (m, hit) in zip(configs, results)]
+    if out_csv:
+        with open(out_csv, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(CONFIG_KEYS) + list(METRIC_KEYS) + ["cached"])
+            w.writeheader()
+            w.writerows(rows)
+    return rows
@@ -0,0 +1,102 @@
+# test_blockmodel.py
+# Block-model checks: the grid walk against dense sampling, drill() grade accumulation
+# against summing the blocks under sampled points, and the tiled file format read back
+# through numpy.memmap.
+# Run with `python -m pytest -q`. Requires numpy.
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+from blockmodel import BlockModel, write_block_model, open_block_model
+from core import grid_walk
+
+def _rays(n, seed):
+    rng = random.Random(seed)
+    for _ in range(n):
+        th = rng.uniform(0.0, 2.0 * math.pi)
+        yield (rng.uniform(-50.0, 1050.0), rng.uniform(-950.0, 50.0)), (math.cos(th), math.sin(th))
+
+def test_grid_walk_matches_sampling():
+    x_min, y_min, cell, nx, ny = 0.0, -900.0, 25.0, 40, 36
+    for p, d in _rays(300, 1):
+        t_max = 800.0
+        cells = list(grid_walk(p, d, t_max, x_min, y_min, cell, nx, ny))
+        # Contiguous, in order, within [0, t_max]
+        for (_, _, a0, b0), (_, _, a1, _) in zip(cells, cells[1:]):
+            assert b0 == pytest.approx(a1)
+            assert a0 <= b0
+        if cells:
+            assert cells[0][2] >= 0.0 and cells[-1][3] <= t_max + 1e-9
+        # Every sample point away from a cell edge is in the cell the walk says
+        for i, j, t0, t1 in cells:
+            for u in (0.25, 0.5, 0.75):
+                t = t0 + (t1 - t0) * u
+                x, y = p[0] + d[0] * t, p[1] + d[1] * t
+                assert (int((x - x_min) // cell), int((y - y_min) // cell)) == (i, j)
+        # ... and no cell is skipped
+        seen = {(i, j) for i, j, _, _ in cells}
+        for t in np.linspace(0.0, t_max, 4001):
+            x, y = p[0] + d[0] * t, p[1] + d[1] * t
+            i, j = (x - x_min) / cell, (y - y_min) / cell
+            if 0 <= i < nx and 0 <= j < ny and min(i % 1, j % 1, -i % 1, -j % 1) > 1e-6:
+                assert (int(i), int(j)) in seen
+
+def _model(seed=2):
+    rng = np.random.default_rng(seed)
+    grade = np.where(rng.random((36, 40)) < 0.2, rng.uniform(0.5, 5.0, (36, 40)), 0.0).astype(np.float32)
+    return BlockModel(grade, 0.0, 0.0, 25.0)
+
+def test_drill_metal_matches_sampling():
+    model = _model()
+    for p, d in _rays(100, 3):
+        end = (p[0] + d[0] * 600.0, p[1] + d[1] * 600.0)
+        trace = model.drill([p, end])
+        n = 6000
+        ts = (np.arange(n) + 0.5) * trace.drilled / n
+        sampled = sum(model.grade_at(p[0] + d[0] * t, p[1] + d[1] * t) for t in ts) * trace.drilled / n
+        # Each block boundary can be off by one sample of the largest grade
+        assert trace.metal == pytest.approx(sampled, abs=5.0 * (len(trace.cells) + 1) * trace.drilled / n)
+        if trace.first_ore() is not None:
+            # The hole stops at the bottom of the last ore block
+            assert trace.cells[-1].grade > 0.0 and trace.drilled == trace.cells[-1].s_out
+        else:
+            assert trace.drilled == pytest.approx(600.0)
+
+def test_polyline_depths():
+    # A two-segment hole with along-hole depths longer than its chords (a curved hole)
+    model = BlockModel(np.ones((4, 4), dtype=np.float32), 0.0, 0.0, 10.0)
+    trace = model.drill([(5.0, 0.0), (5.0, -20.0), (5.0, -40.0)], lengths=[0.0, 25.0, 50.0])
+    assert trace.drilled == pytest.approx(50.0)
+    assert trace.metal == pytest.approx(50.0)
+    assert [c.s_in for c in trace.cells] == pytest.approx([0.0, 12.5, 25.0, 37.5])
+
+# ----------------- Memory-mapped models -----------------
+@pytest.mark.parametrize("shape,tile", [((36, 40), 16), ((64, 64), 64), ((5, 130), 64)])
+def test_tiled_file_round_trip(tmp_path, shape, tile):
+    rng = np.random.default_rng(4)
+    grade = rng.uniform(0.0, 5.0, shape).astype(np.float32)
+    path = str(tmp_path / "model.bm")
+    write_block_model(path, grade, 100.0, -10.0, 12.5, tile=tile)
+    model = open_block_model(path)
+    assert (model.nx, model.ny, model.cell) == (shape[1], shape[0], 12.5)
+    assert (model.x_min, model.y_max) == (100.0, -10.0)
+    assert np.array_equal(model.window(0, shape[0], 0, shape[1]), grade)
+    assert np.array_equal(model.window(1, shape[0], 2, shape[1], step=3), grade[1::3, 2::3])
+    for r, c in ((0, 0), (shape[0] - 1, shape[1] - 1), (shape[0] // 2, shape[1] // 3)):
+        assert model.grade[r, c] == grade[r, c]
+    # Drilling the mapped model matches the in-memory one
+    mem = BlockModel(grade, 100.0, -10.0, 12.5)
+    hole = [(110.0, 0.0), (100.0 + shape[1] * 6.0, -10.0 - shape[0] * 12.5)]
+    assert model.drill(hole) == mem.drill(hole)
+
+def test_open_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_model.bin"
+    path.write_bytes(b"x" * 100)
+    with pytest.raises(ValueError):
+        open_block_model(str(path))
+    path.write_bytes(b"x" * 10)
+    with pytest.raises(ValueError):
+        open_block_model(str(path))
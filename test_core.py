@@ -0,0 +1,44 @@
+# test_core.py
+# Simulation core checks: the exact hit window against integer-angle brute force, and
+# the Δ miss readout of multi-orebody rounds.
+# Run with `python -m pytest -q`.
+
+import pytest
+
+import core
+import sdf
+import shapes
+from orebodies import OrebodyIndex
+
+@pytest.mark.parametrize("round_id", range(40))
+def test_hit_window_matches_brute_force(round_id):
+    rnd = core.round_from_id(round_id * 0x9E3779B97F4A7C15 % 2**64)
+    origin = (rnd.origin_x, core.SURFACE_Y_WORLD)
+    target = (rnd.target_x, rnd.target_y)
+    win = core.hit_window(origin, target, rnd.target_radius)
+    expected = {a for a in range(int(core.ANGLE_MIN), int(core.ANGLE_MAX) + 1)
+                if core.resolve_drill(origin, a, target, rnd.target_radius).hit}
+    assert set(win.integer_angles() if win else ()) == expected
+
+def test_hit_window_edges_hit():
+    # Just inside either end of the window the drill hits, just outside it misses
+    for round_id in range(40):
+        rnd = core.round_from_id(round_id * 0x9E3779B97F4A7C15 % 2**64)
+        origin, target = (rnd.origin_x, core.SURFACE_Y_WORLD), (rnd.target_x, rnd.target_y)
+        win = core.hit_window(origin, target, rnd.target_radius)
+        if win is None:
+            continue
+        for a, hit in ((win.lo + 1e-6, True), (win.hi - 1e-6, True),
+                       (win.lo - 1e-3, False), (win.hi + 1e-3, False)):
+            if core.ANGLE_MIN <= a <= core.ANGLE_MAX:
+                assert core.resolve_drill(origin, a, target, rnd.target_radius).hit == hit
+
+def test_miss_distance_needs_every_shape():
+    g = core.Game(seed=1)
+    g.origin_x = 600.0
+    circle = shapes.Circle(200, -300, 10)
+    g.set_orebodies(OrebodyIndex([circle, sdf.SdfShape(sdf.Box(900, -700, 20, 20))]))
+    assert g.resolve(-120.0).miss_distance == pytest.approx(186.41, abs=0.01)
+    # Polygon has no closest_approach: no partial figure
+    g.set_orebodies(OrebodyIndex([circle, shapes.Polygon([(900, -700), (950, -700), (950, -650)])]))
+    assert g.resolve(-120.0).miss_distance is None
@@ -0,0 +1,63 @@
+# test_desurvey.py
+# Desurvey checks: the vectorized minimum-curvature pass against a per-station loop and
+# closed-form holes, section projection, and orebody intercepts along section polylines.
+# Run with `python -m pytest -q`. Requires numpy.
+
+import math
+
+import numpy as np
+import pytest
+
+import desurvey
+from orebodies import OrebodyIndex
+
+def _reference(depth, dip, azimuth, collar):
+    """Minimum curvature one station at a time."""
+    t = desurvey.directions(dip, azimuth)
+    p = np.asarray(collar, dtype=np.float64) + t[0] * depth[0]
+    out = [p]
+    for i in range(1, len(depth)):
+        beta = math.acos(min(1.0, float(t[i - 1] @ t[i])))
+        rf = 1.0 if beta < 1e-9 else 2.0 / beta * math.tan(beta / 2.0)
+        p = p + (depth[i] - depth[i - 1]) / 2.0 * rf * (t[i - 1] + t[i])
+        out.append(p)
+    return np.array(out)
+
+def test_straight_hole():
+    r = desurvey.desurvey([0, 0, 0], [0, 50, 100], [-90, -90, -90], [0, 0, 0], [[10, 20, 300]])
+    assert np.allclose(r.xyz, [[10, 20, 300], [10, 20, 250], [10, 20, 200]])
+
+def test_constant_curvature_arc():
+    # Dip -90 -> -45 over 100 m heading east: an eighth of a circle
+    r = desurvey.desurvey([0, 0], [0, 100], [-90, -45], [90, 90], [[0, 0, 0]])
+    radius = 100.0 / (math.pi / 4.0)
+    expected = (radius * (1.0 - math.cos(math.pi / 4.0)), 0.0, -radius * math.sin(math.pi / 4.0))
+    assert np.allclose(r.xyz[1], expected)
+
+def test_matches_per_station_loop():
+    rng = np.random.default_rng(0)
+    holes, stations = 50, 12
+    hole = np.repeat(np.arange(holes), stations)
+    depth = np.tile(np.arange(stations) * 20.0, holes) + np.repeat(rng.uniform(0, 5, holes), stations)
+    dip = -60 + rng.normal(0, 5, holes * stations)
+    az = 120 + rng.normal(0, 10, holes * stations)
+    collars = rng.uniform(0, 1000, (holes, 3))
+    r = desurvey.desurvey(hole, depth, dip, az, collars)
+    assert list(r.starts) == list(range(0, holes * stations, stations))
+    for k in range(holes):
+        sl = slice(k * stations, (k + 1) * stations)
+        assert np.allclose(r.xyz[sl], _reference(depth[sl], dip[sl], az[sl], collars[k]))
+
+def test_section_projection():
+    x, y, off = desurvey.project_to_section([[110, 100, 40], [100, 110, 50]], (100, 100, 50), 90.0)
+    assert np.allclose(x, [10, 0]) and np.allclose(y, [-10, 0]) and np.allclose(off, [0, -10])
+
+def test_polyline_intercepts_join_crossings_across_stations():
+    # A vertical hole with stations every 30 m through a 100 m circle, and a 40 m one below
+    index = OrebodyIndex([(0, -100, 50), (0, -220, 20)])
+    line = [(0.0, -30.0 * k) for k in range(10)]
+    got = desurvey.polyline_intercepts(line, index)
+    assert [(k, pytest.approx(a), pytest.approx(b)) for k, a, b in got] == [(0, 50, 150), (1, 200, 240)]
+    # A segment starting exactly on the far edge adds no zero-length touch
+    one = OrebodyIndex([(0, -100, 50)])
+    assert desurvey.polyline_intercepts([(0.0, -30.0 * k) for k in range(8)], one) == [(0, 50.0, 150.0)]
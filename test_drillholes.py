@@ -0,0 +1,66 @@
+# test_drillholes.py
+# CSV importer checks: the streaming join against the source rows, chunk boundaries,
+# header aliases, BOM-prefixed exports and malformed rows.
+# Run with `python -m pytest -q`. Requires numpy.
+
+import numpy as np
+import pytest
+
+import drillholes
+
+def _write(path, header, rows, bom=False):
+    text = "\n".join([",".join(header)] + [",".join(map(str, r)) for r in rows]) + "\n"
+    path.write_text(("\ufeff" if bom else "") + text, encoding="utf-8")
+    return str(path)
+
+@pytest.fixture
+def files(tmp_path):
+    collars = [(f"DH{k:03d}", 100.0 + k, 200.0, 500.0 - k) for k in range(30)]
+    # Survey rows deliberately out of order; one row for a hole with no collar
+    survey = [(f"DH{k:03d}", depth, -60.0 - k % 7, 90.0 + k) for k in range(30) for depth in (100.0, 0.0, 50.0)]
+    survey.append(("XX999", 0.0, -90.0, 0.0))
+    assays = [(f"DH{k:03d}", f, f + 1.0, 0.1 * k) for k in range(0, 30, 3) for f in (10.0, 20.0)]
+    return (_write(tmp_path / "collar.csv", ("HOLEID", "EAST", "NORTH", "RL"), collars),
+            _write(tmp_path / "survey.csv", ("hole_id", "depth", "dip", "azimuth"), survey),
+            _write(tmp_path / "assay.csv", ("BHID", "FROM", "TO", "Au"), assays))
+
+@pytest.mark.parametrize("chunk_rows", [7, drillholes.CHUNK_ROWS])
+def test_import_joins_and_sorts(files, chunk_rows):
+    dh = drillholes.import_drillholes(*files, chunk_rows=chunk_rows)
+    assert len(dh) == 30 and dh.ids[5] == "DH005"
+    assert np.allclose(dh.collars[5], (105.0, 200.0, 495.0))
+    assert len(dh.depth) == 90 and dh.stats[1].skipped == 1
+    assert (np.diff(dh.survey_hole) >= 0).all()
+    assert list(dh.depth[:3]) == [0.0, 50.0, 100.0]
+    assert dh.dip[3] == pytest.approx(-61.0)
+    assert len(dh.grade) == 20 and dh.grade[2] == pytest.approx(0.3)
+    xyz = dh.assay_xyz()
+    holes = dh.desurvey()
+    # DH000's first assay, mid-depth 10.5 m: between its first two stations
+    assert np.allclose(xyz[0], holes.xyz[0] + (holes.xyz[1] - holes.xyz[0]) * (10.5 / 50.0))
+
+def test_bom_and_blank_rows(tmp_path):
+    # Excel-style export: UTF-8 BOM, CRLF line ends and a blank line
+    (tmp_path / "collar.csv").write_bytes(b"\xef\xbb\xbfHoleID,East,North,Elevation\r\n"
+                                          b"A,0,0,100\r\n\r\nB,10,0,100\r\n")
+    survey = _write(tmp_path / "survey.csv", ("HoleID", "At", "Dip", "Azi"),
+                    [("A", 0, -90, 0), ("B", 0, -45, 90)], bom=True)
+    dh = drillholes.import_drillholes(str(tmp_path / "collar.csv"), survey)
+    assert dh.ids == ["A", "B"]
+    assert dh.stats[0].rows == 2
+
+def test_short_row_reports_its_line(tmp_path):
+    survey = _write(tmp_path / "survey.csv", ("hole", "depth", "dip", "azimuth"),
+                    [("A", 0, -90, 0), ("A", 10, -90)])
+    with pytest.raises(ValueError, match="row 3 has 3 fields"):
+        list(drillholes.read_chunks(survey, drillholes.SURVEY_COLUMNS))
+
+def test_missing_column(tmp_path):
+    survey = _write(tmp_path / "survey.csv", ("hole", "depth", "dip"), [("A", 0, -90)])
+    with pytest.raises(ValueError, match="azimuth"):
+        list(drillholes.read_chunks(survey, drillholes.SURVEY_COLUMNS))
+
+def test_assay_xyz_needs_assays(files):
+    dh = drillholes.import_drillholes(*files[:2])
+    with pytest.raises(ValueError):
+        dh.assay_xyz()
@@ -0,0 +1,54 @@
+# test_drillpath.py
+# Curved-hole checks: a zero-rate profile drills exactly the straight hole, constant
+# rates trace a circular arc, and lift() integrates the rate table.
+# Run with `python -m pytest -q`.
+
+import math
+
+import pytest
+
+import core
+import drillpath
+
+@pytest.mark.parametrize("seed", range(20))
+def test_zero_rate_path_matches_straight_hole(seed):
+    g = core.Game(seed=seed)
+    win = g.hit_window()
+    for angle in (win.optimal if win else -90.0, -30.0, -90.0, -150.0):
+        g.deviation = None
+        straight = g.resolve(angle)
+        g.deviation = drillpath.DeviationProfile.constant(0.0)
+        curved = g.resolve(angle)
+        assert curved.hit == straight.hit
+        assert curved.path_length == pytest.approx(straight.path_length, abs=1e-6)
+        assert curved.end_point == pytest.approx(straight.end_point, abs=1e-6)
+
+@pytest.mark.parametrize("rate", [3.0, -2.0])
+def test_constant_rate_traces_an_arc(rate):
+    path = drillpath.DeviationProfile.constant(rate).path((500.0, 0.0), -60.0)
+    path.extend_to(600.0)
+    # Radius of curvature for `rate` degrees per 100 m; the centre sits off the collar
+    # perpendicular to the initial heading, on the side the hole turns toward
+    radius = 100.0 / math.radians(abs(rate))
+    turn = math.copysign(1.0, rate * path.side)
+    a = math.radians(-60.0)
+    cx, cy = 500.0 - turn * radius * math.sin(a), turn * radius * math.cos(a)
+    for (x, y), s, angle in zip(path.points, path.lengths, path.angles):
+        assert math.hypot(x - cx, y - cy) == pytest.approx(radius, rel=1e-9)
+        assert angle == pytest.approx(-60.0 + path.side * rate * s / 100.0)
+
+def test_lift_integrates_the_table():
+    p = drillpath.DeviationProfile(((100.0, 10.0), (200.0, -4.0), (300.0, 0.0)))
+    assert p.lift(0.0, 100.0) == 0.0
+    assert p.lift(0.0, 200.0) == pytest.approx(10.0)
+    assert p.lift(95.0, 105.0) == pytest.approx(0.5)
+    assert p.lift(150.0, 250.0) == pytest.approx(5.0 - 2.0)
+    assert p.lift(0.0, 1000.0) == pytest.approx(10.0 - 4.0)
+
+def test_point_at_follows_the_polyline():
+    path = drillpath.DeviationProfile.constant(4.0).path((300.0, 0.0), -120.0)
+    path.extend_to(400.0)
+    for p, s in zip(path.points, path.lengths):
+        assert path.point_at(s) == pytest.approx(p)
+    # Playback goes forward, but seeking backwards still works
+    assert path.point_at(0.0) == pytest.approx((300.0, 0.0))
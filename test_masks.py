@@ -0,0 +1,65 @@
+# test_masks.py
+# Bitmap orebody checks: pixel walks against sampling the mask, the distance field
+# against an analytic disc, and the field being ready once the orebodies are set.
+# Run with `python -m pytest -q`. Requires numpy.
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+import core
+import masks
+import shapes
+from orebodies import OrebodyIndex
+
+def _rays(n, seed):
+    rng = random.Random(seed)
+    for _ in range(n):
+        th = rng.uniform(0.0, 2.0 * math.pi)
+        yield (rng.uniform(0.0, 1000.0), rng.uniform(-900.0, 0.0)), (math.cos(th), math.sin(th))
+
+def _disc(cx=500, cy=400, r=40.0, inner=0.0):
+    yy, xx = np.mgrid[0:900, 0:1000]
+    rr = np.hypot(xx + 0.5 - cx, yy + 0.5 - cy)
+    return (rr <= r) & (rr > inner)
+
+def test_distance_transform_is_exact():
+    rng = np.random.default_rng(1)
+    mask = rng.random((40, 50)) < 0.02
+    mask[0, 0] = True
+    ys, xs = np.nonzero(mask)
+    yy, xx = np.mgrid[0:40, 0:50]
+    brute = np.min(np.hypot(yy[..., None] - ys, xx[..., None] - xs), axis=-1)
+    assert np.allclose(masks.distance_transform(mask), brute)
+
+def test_intervals_match_pixels():
+    shape = masks.MaskShape(_disc(inner=20.0))   # a ring: rays through it cross twice
+    for p, d in _rays(100, 2):
+        ivs = shape.intervals(p, d)
+        for t in np.linspace(-1500.0, 1500.0, 3001):
+            x, y = p[0] + d[0] * t, p[1] + d[1] * t
+            col, row = math.floor(x), math.floor(-y)
+            if 0 <= col < shape.nx and 0 <= row < shape.ny and min(x % 1, y % 1) > 1e-6:
+                assert any(a <= t <= b for a, b in ivs) == bool(shape.mask[row, col])
+
+def test_trace_reports_both_sides_of_a_ring():
+    index = OrebodyIndex([masks.MaskShape(_disc(inner=20.0))])
+    res = index.trace((400.0, -400.5), (1.0, 0.0), 200.0)
+    assert len(res.hits) == 2
+    assert res.intercepted_length == pytest.approx(40.0, abs=2.0)
+
+def test_closest_approach_matches_disc():
+    mask = masks.MaskShape(_disc())
+    disc = shapes.Circle(500, -400, 40)
+    for p, d in _rays(200, 4):
+        t_max = core.drill_exit_distance(p, d)
+        assert mask.closest_approach(p, d, t_max) == pytest.approx(disc.closest_approach(p, d, t_max), abs=2.0)
+
+def test_set_orebodies_builds_the_field():
+    shape = masks.MaskShape(_disc())
+    assert shape._field is None
+    g = core.Game(seed=1)
+    g.set_orebodies(OrebodyIndex([shape]))
+    assert shape._field is not None
@@ -0,0 +1,74 @@
+# test_orebodies.py
+# Orebody index checks: first_hit and trace against testing every orebody directly.
+# Run with `python -m pytest -q`.
+
+import math
+import random
+
+import pytest
+
+import core
+import shapes
+from orebodies import OrebodyIndex
+
+def _rays(n, seed):
+    rng = random.Random(seed)
+    for _ in range(n):
+        th = rng.uniform(0.0, 2.0 * math.pi)
+        yield (rng.uniform(0.0, 1000.0), rng.uniform(-900.0, 0.0)), (math.cos(th), math.sin(th))
+
+def _bodies(n, seed):
+    rng = random.Random(seed)
+    return [(rng.uniform(0, 1000), rng.uniform(-900, -50), rng.uniform(5, 30)) for _ in range(n)]
+
+@pytest.mark.parametrize("cell_size", [None, 7.0, 400.0])
+def test_first_hit_matches_brute_force(cell_size):
+    index = OrebodyIndex(_bodies(200, 1), cell_size)
+    for p, d in _rays(500, 2):
+        t_max = core.drill_exit_distance(p, d)
+        spans = [s.ray_interval(p, d, t_max) for s in index.shapes]
+        best = min((span[0] for span in spans if span is not None), default=None)
+        hit = index.first_hit(p, d, t_max)
+        assert (hit is None) == (best is None)
+        if hit is not None:
+            assert hit.t_in == pytest.approx(best)
+            assert spans[hit.index][0] == pytest.approx(best)
+
+def test_trace_matches_brute_force():
+    index = OrebodyIndex(_bodies(200, 3))
+    for p, d in _rays(200, 4):
+        t_max = core.drill_exit_distance(p, d)
+        res = index.trace(p, d, t_max)
+        expected = {k for k, s in enumerate(index.shapes) if s.ray_interval(p, d, t_max) is not None}
+        assert {h.index for h in res.hits} == expected
+        assert res.first == (res.hits[0] if res.hits else None)
+        # Length inside any orebody, by dense sampling; each boundary costs one sample
+        n = 5000
+        crossed = [index.shapes[k] for k in expected]
+        inside = sum(any(s.contains((p[0] + d[0] * t, p[1] + d[1] * t)) for s in crossed)
+                     for t in ((k + 0.5) * t_max / n for k in range(n)))
+        assert res.intercepted_length == pytest.approx(inside * t_max / n, abs=2.0 * len(crossed) * t_max / n)
+
+def test_resolve_drill_uses_index():
+    g = core.Game(seed=5)
+    index = OrebodyIndex.from_round(g, extra=_bodies(50, 6))
+    for angle in range(-180, 1, 3):
+        r = core.resolve_drill(g.get_origin(), angle, (g.target_x, g.target_y), g.target_radius, index)
+        hit = index.first_hit(g.get_origin(), r.direction, core.drill_exit_distance(g.get_origin(), r.direction))
+        assert r.hit == (hit is not None)
+        if r.hit:
+            assert r.target_index == hit.index
+            assert r.path_length == pytest.approx(hit.t_in)
+
+# A U open at the top: x 50..150, y -200..-100, with the slot x 70..130 down to y -180
+U_SHAPE = [(50, -200), (150, -200), (150, -100), (130, -100), (130, -180), (70, -180), (70, -100), (50, -100)]
+
+def test_trace_reports_every_crossing_of_a_concave_orebody():
+    index = OrebodyIndex([shapes.Polygon(U_SHAPE)])
+    res = index.trace((0.0, -150.0), (1.0, 0.0), 300.0)
+    assert [(h.t_in, h.t_out) for h in res.hits] == [(50.0, 70.0), (130.0, 150.0)]
+    assert res.intercepted_length == pytest.approx(40.0)
+    # Clipped to the trace, and starting inside the first arm
+    res = index.trace((60.0, -150.0), (1.0, 0.0), 80.0)
+    assert [(h.t_in, h.t_out) for h in res.hits] == [(0.0, 10.0), (70.0, 80.0)]
+    assert index.first_hit((0.0, -150.0), (1.0, 0.0), 300.0).t_out == pytest.approx(70.0)
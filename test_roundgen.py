@@ -0,0 +1,45 @@
+# test_roundgen.py
+# Filtered round generation checks: accepted rounds match the scalar DifficultyBand
+# test and round_from_id, and `drawn` counts exactly the candidates looked at.
+# Run with `python -m pytest -q`. Requires numpy.
+
+import numpy as np
+import pytest
+
+import core
+import roundgen
+
+BAND = core.DifficultyBand(min_int_angles=2, max_int_angles=6, max_cost=200000.0)
+
+def test_accepted_rounds_pass_scalar_band():
+    out = roundgen.generate_filtered(50, BAND, seed=1, batch_size=4096)
+    assert len(out.cost) == 50
+    for k, round_id in enumerate(out.rounds.round_id):
+        rnd = core.round_from_id(int(round_id))
+        assert BAND.accepts(rnd)
+        assert out.rounds.target_x[k] == pytest.approx(rnd.target_x)
+
+def test_drawn_counts_candidates_up_to_last_accepted():
+    n, batch_size = 30, 1000
+    out = roundgen.generate_filtered(n, BAND, seed=2, batch_size=batch_size)
+    # Replay the candidate stream and find the n-th accepted candidate
+    rng = np.random.default_rng(2)
+    seen = accepted = 0
+    while True:
+        ids = rng.integers(0, 2**64, size=batch_size, dtype=np.uint64)
+        pack = roundgen.generate_rounds(round_ids=ids)
+        keep = np.flatnonzero(roundgen.band_mask(BAND, *roundgen.score_rounds(pack)))
+        if accepted + len(keep) >= n:
+            expected = seen + int(keep[n - accepted - 1]) + 1
+            break
+        accepted += len(keep)
+        seen += batch_size
+    assert out.drawn == expected
+    assert out.acceptance == pytest.approx(n / expected)
+
+def test_max_drawn_stops_early():
+    out = roundgen.generate_filtered(10, core.DifficultyBand(min_int_angles=1000), seed=3,
+                                     batch_size=500, max_drawn=2000)
+    assert len(out.cost) == 0
+    assert out.drawn == 2000
+    assert out.acceptance == 0.0
@@ -0,0 +1,47 @@
+# test_roundpool.py
+# Round pool checks: pops are validated rounds, from the worker or the synchronous
+# fallback, and a validator that rejects everything raises instead of hanging.
+# Run with `python -m pytest -q`.
+
+import time
+
+import pytest
+
+import roundpool
+
+def test_pop_without_worker_validates():
+    pool = roundpool.RoundPool(seed=1)
+    for _ in range(20):
+        assert roundpool.validate_reachable(pool.pop())
+    assert pool.stats()["empty_pops"] == 20
+
+def test_worker_fills_pool():
+    with roundpool.RoundPool(size=4, seed=2) as pool:
+        deadline = time.monotonic() + 5.0
+        while pool.depth() < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.depth() == 4
+        rnd = pool.pop()
+    assert roundpool.validate_reachable(rnd)
+    assert pool.stats()["empty_pops"] == 0
+
+def test_seeded_pools_agree():
+    a = roundpool.RoundPool(seed=3)
+    b = roundpool.RoundPool(seed=3)
+    assert [a.pop().round_id for _ in range(5)] == [b.pop().round_id for _ in range(5)]
+
+def test_rejecting_everything_raises():
+    pool = roundpool.RoundPool(validate=lambda rnd: False, max_attempts=10)
+    with pytest.raises(roundpool.RoundPoolError):
+        pool.pop()
+    assert pool.stats()["rejected"] == 10
+
+def test_worker_error_reaches_pop():
+    with roundpool.RoundPool(validate=lambda rnd: False, max_attempts=10) as pool:
+        pool._thread.join(5.0)
+        with pytest.raises(roundpool.RoundPoolError):
+            pool.pop()
+
+def test_zero_attempts_rejected():
+    with pytest.raises(ValueError):
+        roundpool.RoundPool(max_attempts=0)
@@ -0,0 +1,54 @@
+# test_shapes.py
+# Shape protocol checks: every shape's NumPy batch kernels agree with its scalar
+# ray_interval() and signed_distance(), and intervals() agree with point sampling.
+# Run with `python -m pytest -q`. Requires numpy.
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+import shapes
+
+SHAPES = [
+    shapes.Circle(500, -400, 60),
+    shapes.Ellipse(400, -300, 120, 40, 30),
+    shapes.Polygon([(300, -200), (700, -250), (650, -500), (450, -420), (350, -600)]),
+    shapes.Capsule(200, -700, 600, -550, 25),
+    shapes.Lens((500, -400), 80, (560, -400), 80),
+]
+
+def _rays(n, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        th = rng.uniform(0.0, 2.0 * math.pi)
+        out.append(((rng.uniform(0.0, 1000.0), rng.uniform(-900.0, 0.0)), (math.cos(th), math.sin(th))))
+    return out
+
+@pytest.mark.parametrize("shape", SHAPES, ids=lambda s: type(s).__name__)
+def test_batch_matches_scalar(shape):
+    rays = _rays(500)
+    o = np.array([p for p, _ in rays])
+    d = np.array([v for _, v in rays])
+    hit, t_in, t_out = shape.ray_interval_batch(o, d)
+    for k, (p, v) in enumerate(rays):
+        span = shape.ray_interval(p, v)
+        assert hit[k] == (span is not None)
+        if span is not None:
+            assert t_in[k] == pytest.approx(span[0], abs=1e-6)
+            assert t_out[k] == pytest.approx(span[1], abs=1e-6)
+    assert np.allclose(shape.signed_distance_batch(o), [shape.signed_distance(p) for p in o])
+
+@pytest.mark.parametrize("shape", SHAPES, ids=lambda s: type(s).__name__)
+def test_intervals_match_sampling(shape):
+    for p, d in _rays(100, seed=1):
+        ivs = shape.intervals(p, d)
+        assert all(a <= b for a, b in ivs)
+        assert all(ivs[k][1] <= ivs[k + 1][0] for k in range(len(ivs) - 1))
+        for t in np.linspace(-1500.0, 1500.0, 601):
+            x = (p[0] + d[0] * t, p[1] + d[1] * t)
+            dist = shape.signed_distance(x)
+            if abs(dist) > 1e-6:
+                assert any(a <= t <= b for a, b in ivs) == (dist < 0.0)